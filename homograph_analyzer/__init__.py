@@ -25,11 +25,18 @@ from .homograph_domain_analyzer import (
     DomainAnalyzer,
     DomainVariant,
     AnalysisConfig,
+    ResultSummary,
     OutputFormatter,
     HOMOGRAPH_MAPPINGS,
     LEETSPEAK_MAPPINGS,
     KEYBOARD_TYPOS,
     ALTERNATIVE_TLDS,
+    TRUST_LEVELS,
+    SUSPICIOUS_TRUST_LEVELS,
+    HIGH_RISK_TRUST_LEVELS,
+    TECHNIQUES,
+    normalize_techniques,
+    homograph_skeleton,
 )
 
 __all__ = [
@@ -37,9 +44,16 @@ __all__ = [
     'DomainAnalyzer', 
     'DomainVariant',
     'AnalysisConfig',
+    'ResultSummary',
     'OutputFormatter',
     'HOMOGRAPH_MAPPINGS',
     'LEETSPEAK_MAPPINGS',
     'KEYBOARD_TYPOS',
     'ALTERNATIVE_TLDS',
+    'TRUST_LEVELS',
+    'SUSPICIOUS_TRUST_LEVELS',
+    'HIGH_RISK_TRUST_LEVELS',
+    'TECHNIQUES',
+    'normalize_techniques',
+    'homograph_skeleton',
 ]
@@ -15,13 +15,23 @@ Example usage:
         print(f"Suspicious: {domain['domain']} ({domain['age_days']} days old)")
 """
 
+import os
+import re
 import json
-from datetime import datetime
-from typing import Dict, List, Optional, Set, Any
-from dataclasses import dataclass, asdict
+import asyncio
+import hashlib
+import socket
+import tempfile
+import statistics
+from collections import Counter, OrderedDict, deque
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Set, Tuple, Any
+from dataclasses import dataclass, replace
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import time
 import logging
+from operator import attrgetter
+from importlib.util import find_spec
 
 # Import from main module
 from homograph_domain_analyzer import (
@@ -33,12 +43,383 @@ from homograph_domain_analyzer import (
     LEETSPEAK_MAPPINGS,
     KEYBOARD_TYPOS,
     ALTERNATIVE_TLDS,
+    TECHNIQUES,
+    homograph_skeleton,
+    dump_json,
     DNS_AVAILABLE,
     WHOIS_AVAILABLE
 )
 
+# Imported in _async_resolve_batch on first use
+try:
+    ASYNC_DNS_AVAILABLE = find_spec('dns.asyncresolver') is not None
+except ImportError:
+    ASYNC_DNS_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Record types resolved for every variant
+DNS_RECORD_TYPES = ('A', 'AAAA', 'MX', 'NS')
+
+# Public resolvers that can be passed as ``dns_resolvers=`` to hedge tail
+# latency; opt-in, since it sends every looked-up name to third parties
+PUBLIC_DNS_RESOLVERS = ['1.1.1.1', '8.8.8.8', '9.9.9.9']
+
+# Lower bound for the adaptive per-query DNS timeout, in seconds
+DNS_MIN_TIMEOUT = 0.2
+
+# In-memory DNS answer cache: entry limit, TTL cap and lifetime of
+# NXDOMAIN/NoAnswer results, in seconds
+DNS_CACHE_SIZE = 10000
+DNS_CACHE_MAX_TTL = 3600
+DNS_NEGATIVE_TTL = 300
+
+
+class _LatencyStats:
+    """
+    Rolling p95 of DNS response latencies, used to derive query timeouts.
+    
+    Once enough responses have been seen, the effective timeout becomes
+    max(floor, 2 * p95), capped by the configured timeout. It bounds the
+    first attempt only; queries that hit it are retried once with the rest
+    of the configured timeout, so a slow server is not mistaken for a
+    missing name and no query takes longer than the configured timeout.
+    """
+    
+    def __init__(self, window: int = 500, min_samples: int = 20, refresh_every: int = 50):
+        self._samples = deque(maxlen=window)
+        self._min_samples = min_samples
+        self._refresh_every = refresh_every
+        self._since_refresh = 0
+        self.p95: Optional[float] = None
+    
+    def record(self, seconds: float) -> None:
+        """Record the latency of a query that got a definitive response."""
+        self._samples.append(seconds)
+        self._since_refresh += 1
+        if len(self._samples) >= self._min_samples and (
+            self.p95 is None or self._since_refresh >= self._refresh_every
+        ):
+            self.p95 = statistics.quantiles(self._samples, n=20)[18]
+            self._since_refresh = 0
+    
+    def timeout(self, ceiling: float, floor: float = DNS_MIN_TIMEOUT) -> float:
+        """Get the effective timeout, never above the configured ceiling."""
+        if self.p95 is None:
+            return ceiling
+        return min(ceiling, max(floor, 2 * self.p95))
+
+
+class _DNSCache:
+    """
+    LRU cache of DNS answers keyed by (name, record type) that honours TTLs.
+    
+    Answers live for their rrset TTL and definitive negatives (NXDOMAIN or
+    NoAnswer, stored as None) for DNS_NEGATIVE_TTL, both capped at
+    ``max_ttl``. Failed lookups (timeouts, SERVFAIL) are never stored.
+    """
+    
+    MISS = object()
+    
+    def __init__(self, maxsize: int = DNS_CACHE_SIZE, max_ttl: float = DNS_CACHE_MAX_TTL):
+        self.maxsize = maxsize
+        self.max_ttl = max_ttl
+        self._entries: OrderedDict = OrderedDict()
+    
+    def get(self, key: Tuple[str, str]) -> Any:
+        """Get the cached answer for a key, or MISS if absent or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return self.MISS
+        expires, answer = entry
+        if expires <= time.monotonic():
+            del self._entries[key]
+            return self.MISS
+        self._entries.move_to_end(key)
+        return answer
+    
+    def put(self, key: Tuple[str, str], answer: Optional[List[str]], ttl: float) -> None:
+        """Store an answer for ``ttl`` seconds, evicting the least recently used."""
+        ttl = min(ttl, self.max_ttl)
+        if ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl, answer)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+# Simplified risk level for each entry of TRUST_LEVELS, indexed by trust_code
+TRUST_TO_RISK = (
+    'UNREGISTERED', 'UNKNOWN', 'LOW', 'MEDIUM',
+    'MEDIUM', 'HIGH', 'HIGH', 'HIGH',
+)
+
+# On-disk WHOIS cache defaults
+WHOIS_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'homograph_analyzer', 'whois')
+WHOIS_CACHE_TTL = 7 * 86400  # seconds
+WHOIS_NEGATIVE_CACHE_TTL = 3600  # seconds, for lookups that returned nothing
+
+# Registry WHOIS servers (RFC 3912, port 43) that answer a bare domain query
+# with the standard "Creation Date:"/"Registrar:" layout. Other TLDs go
+# through python-whois.
+WHOIS_SERVERS: Dict[str, str] = {
+    'com': 'whois.verisign-grs.com',
+    'net': 'whois.verisign-grs.com',
+    'org': 'whois.pir.org',
+    'info': 'whois.nic.info',
+    'biz': 'whois.nic.biz',
+    'io': 'whois.nic.io',
+    'co': 'whois.nic.co',
+    'app': 'whois.nic.google',
+    'dev': 'whois.nic.google',
+    'ai': 'whois.nic.ai',
+    'xyz': 'whois.nic.xyz',
+    'online': 'whois.nic.online',
+    'site': 'whois.nic.site',
+    'website': 'whois.nic.website',
+    'tech': 'whois.nic.tech',
+    'store': 'whois.nic.store',
+    'shop': 'whois.nic.shop',
+    'club': 'whois.nic.club',
+    'top': 'whois.nic.top',
+    'us': 'whois.nic.us',
+}
+WHOIS_SERVER_CONCURRENCY = 8  # simultaneous connections per WHOIS server
+WHOIS_THREAD_FACTOR = 4  # WHOIS-only threaded pass: threads per configured worker
+
+_WHOIS_FIELD_PATTERNS = {
+    'creation_date': re.compile(
+        r'^\s*(?:Creation Date|Created On|Registration Time|Registered On):\s*(.+)$',
+        re.IGNORECASE | re.MULTILINE
+    ),
+    'expiration_date': re.compile(
+        r'^\s*(?:Registry Expiry Date|Registrar Registration Expiration Date|Expiration Date):\s*(.+)$',
+        re.IGNORECASE | re.MULTILINE
+    ),
+    'registrar': re.compile(r'^\s*Registrar:\s*(.+)$', re.IGNORECASE | re.MULTILINE),
+}
+_WHOIS_NAME_SERVER_PATTERN = re.compile(r'^\s*Name Server:\s*(\S+)', re.IGNORECASE | re.MULTILINE)
+# Registry answers for names that are not registered (Verisign, PIR,
+# Identity Digital, Google, CentralNic, .co)
+_WHOIS_NOT_FOUND_PATTERN = re.compile(
+    r'^\s*(?:No match for|NOT FOUND|Domain not found|No Data Found|'
+    r'The queried object does not exist|No entries found)',
+    re.IGNORECASE | re.MULTILINE
+)
+
+
+def _whois_server_for(domain: str) -> Optional[str]:
+    """Get the port-43 WHOIS server for a domain's TLD, if known."""
+    return WHOIS_SERVERS.get(domain.rsplit('.', 1)[-1].lower())
+
+
+def _parse_whois_date(value: str) -> Optional[datetime]:
+    """Parse a WHOIS timestamp into a naive UTC datetime."""
+    value = re.sub(r'\.\d+', '', value.strip()).replace('Z', '+00:00')
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        try:
+            parsed = datetime.strptime(value[:10], '%Y-%m-%d')
+        except ValueError:
+            return None
+    
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _parse_whois_response(text: str) -> Optional[Tuple[Optional[datetime], Optional[str], Dict]]:
+    """
+    Extract creation date, registrar and key fields from a raw WHOIS response.
+    
+    A recognised not-found answer ("No match for ...") gives
+    ``(None, None, {})``, the empty result python-whois lookups produce.
+    Returns None when the response carries neither a creation date nor a
+    registrar and is not such an answer, so the caller can fall back.
+    """
+    fields = {}
+    for name, pattern in _WHOIS_FIELD_PATTERNS.items():
+        match = pattern.search(text)
+        if match:
+            fields[name] = match.group(1).strip()
+    
+    creation_date = _parse_whois_date(fields['creation_date']) if 'creation_date' in fields else None
+    registrar = fields.get('registrar')
+    if not creation_date and not registrar:
+        if _WHOIS_NOT_FOUND_PATTERN.search(text):
+            return None, None, {}
+        return None
+    
+    name_servers = _WHOIS_NAME_SERVER_PATTERN.findall(text)
+    if name_servers:
+        fields['name_servers'] = [ns.lower() for ns in name_servers]
+    
+    return creation_date, registrar, fields
+
+
+async def _whois_query(server: str, domain: str) -> str:
+    """Send one WHOIS query over TCP port 43 and read the response to EOF."""
+    reader, writer = await asyncio.open_connection(server, 43)
+    try:
+        writer.write(domain.encode('idna') + b'\r\n')
+        await writer.drain()
+        data = await reader.read()
+    finally:
+        writer.close()
+    return data.decode('utf-8', errors='replace')
+
+
+def _run_coroutine(coro):
+    """
+    Run a coroutine to completion from synchronous code.
+    
+    asyncio.run() refuses to start while an event loop is already running
+    in this thread (Jupyter, async web handlers, any ``async def`` caller),
+    so in that case the coroutine gets its own loop on a worker thread.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
+
+
+class CachedDomainAnalyzer(DomainAnalyzer):
+    """
+    DomainAnalyzer that serves WHOIS lookups from an on-disk JSON cache.
+    
+    Each domain is stored as ``<sha1(domain)>.json`` holding ``{ts, data}``.
+    Entries younger than ``cache_ttl`` seconds are returned without any
+    outbound WHOIS connection. Registry "not found" answers are stored too,
+    flagged ``negative``, and expire after the shorter ``negative_ttl``;
+    failed lookups (timeouts, rate limits) are never cached.
+    Instances sharing a ``cache_dir`` share hits, so overlapping variants
+    across runs or batch targets are queried once. If ``cache_dir`` cannot
+    be created or written (read-only or missing HOME), lookups still work,
+    just uncached.
+    """
+    
+    def __init__(
+        self,
+        config: AnalysisConfig,
+        cache_dir: str = WHOIS_CACHE_DIR,
+        cache_ttl: int = WHOIS_CACHE_TTL,
+        negative_ttl: int = WHOIS_NEGATIVE_CACHE_TTL
+    ):
+        super().__init__(config)
+        self.cache_dir = cache_dir
+        self.cache_ttl = cache_ttl
+        self.negative_ttl = negative_ttl
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+        except OSError as e:
+            logger.warning(f"WHOIS cache disabled, cannot create {cache_dir}: {e}")
+            self.cache_dir = None
+    
+    def _cache_path(self, domain: str) -> str:
+        """Get the cache file path for a domain."""
+        key = hashlib.sha1(domain.lower().rstrip('.').encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json")
+    
+    def _cache_get(self, domain: str) -> Optional[Dict[str, Any]]:
+        """Return the cached payload for a domain, or None if missing/expired."""
+        if self.cache_dir is None:
+            return None
+        try:
+            with open(self._cache_path(domain), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict):
+            return None
+        
+        ttl = self.negative_ttl if entry.get('negative') else self.cache_ttl
+        if time.time() - entry.get('ts', 0) > ttl:
+            return None
+        return entry.get('data')
+    
+    def _cache_put(self, domain: str, payload: Dict[str, Any], negative: bool = False) -> None:
+        """Atomically write a payload to the cache."""
+        if self.cache_dir is None:
+            return
+        entry = {'ts': time.time(), 'data': payload}
+        if negative:
+            entry['negative'] = True
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        except OSError as e:
+            logger.debug(f"WHOIS cache write failed for {domain}: {e}")
+            return
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self._cache_path(domain))
+        except OSError as e:
+            logger.debug(f"WHOIS cache write failed for {domain}: {e}")
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+    
+    def cached_whois(self, domain: str) -> Optional[Tuple[Optional[datetime], Optional[str], Dict]]:
+        """Return cached (creation_date, registrar, whois_data) for a domain, if fresh."""
+        cached = self._cache_get(domain)
+        if cached is None:
+            return None
+        
+        creation_date = cached.get('creation_date')
+        if creation_date:
+            try:
+                creation_date = datetime.fromisoformat(creation_date)
+            except (TypeError, ValueError):
+                # Corrupt entry; treat it as a miss
+                return None
+        return creation_date, cached.get('registrar'), cached.get('whois_data', {})
+    
+    def store_whois(
+        self,
+        domain: str,
+        creation_date: Optional[datetime],
+        registrar: Optional[str],
+        whois_data: Dict
+    ) -> None:
+        """Cache a WHOIS result.
+        
+        An empty result must be a registry's not-found answer; it is cached
+        for ``negative_ttl`` only.
+        """
+        self._cache_put(domain, {
+            'creation_date': creation_date.isoformat() if creation_date else None,
+            'registrar': registrar,
+            'whois_data': {k: str(v) for k, v in whois_data.items()},
+        }, negative=not (creation_date or registrar or whois_data))
+    
+    def get_whois(self, domain: str) -> Tuple[Optional[datetime], Optional[str], Dict]:
+        """Get WHOIS data for a domain, consulting the cache first."""
+        cached = self.cached_whois(domain)
+        if cached is not None:
+            return cached
+        
+        if not WHOIS_AVAILABLE:
+            return None, None, {}
+        
+        try:
+            result = self._query_whois(domain)
+        except Exception as e:
+            logger.debug(f"WHOIS error for {domain}: {e}")
+            # Timeouts and rate limits say nothing about registration;
+            # only a registry's not-found answer is cached as a negative
+            if _WHOIS_NOT_FOUND_PATTERN.search(str(e)):
+                self.store_whois(domain, None, None, {})
+            return None, None, {}
+        
+        if any(result):
+            self.store_whois(domain, *result)
+        return result
+
 
 class HomographDomainAnalyzer:
     """
@@ -55,6 +436,10 @@ class HomographDomainAnalyzer:
         dns_timeout (float): Timeout for DNS queries
         whois_timeout (float): Timeout for WHOIS queries
         max_workers (int): Number of concurrent workers
+        dns_concurrency (int): Maximum in-flight asynchronous DNS queries
+        dns_resolvers (list): Extra resolver IPs each DNS query is hedged across
+        whois_cache_dir (str): Directory for cached WHOIS results (None disables)
+        whois_cache_ttl (int): Seconds a cached WHOIS result stays valid
     """
     
     def __init__(
@@ -62,7 +447,11 @@ class HomographDomainAnalyzer:
         trust_threshold_years: float = 2.0,
         dns_timeout: float = 5.0,
         whois_timeout: float = 10.0,
-        max_workers: int = 10
+        max_workers: int = 10,
+        dns_concurrency: int = 500,
+        dns_resolvers: Optional[List[str]] = None,
+        whois_cache_dir: Optional[str] = WHOIS_CACHE_DIR,
+        whois_cache_ttl: int = WHOIS_CACHE_TTL
     ):
         """
         Initialize the analyzer.
@@ -72,17 +461,35 @@ class HomographDomainAnalyzer:
             dns_timeout: Timeout for DNS lookups in seconds
             whois_timeout: Timeout for WHOIS queries in seconds
             max_workers: Number of concurrent analysis threads
+            dns_concurrency: Maximum in-flight DNS queries on the async resolver
+            dns_resolvers: Resolver IPs raced against the system resolver,
+                e.g. PUBLIC_DNS_RESOLVERS (None = system resolver only)
+            whois_cache_dir: Directory for the on-disk WHOIS cache (None = no cache)
+            whois_cache_ttl: Lifetime of cached WHOIS results in seconds
         """
         self.trust_threshold_years = trust_threshold_years
         self.trust_threshold_days = int(trust_threshold_years * 365.25)
         self.dns_timeout = dns_timeout
         self.whois_timeout = whois_timeout
         self.max_workers = max_workers
+        self.dns_concurrency = dns_concurrency
+        self.dns_resolvers = list(dns_resolvers or [])
+        self._dns_latency = _LatencyStats()
+        self._dns_cache = _DNSCache()
+        self._quick_analyzers: Dict[Tuple, DomainAnalyzer] = {}
+        self.whois_cache_dir = whois_cache_dir
+        self.whois_cache_ttl = whois_cache_ttl
         
         # Check available features
         self._dns_available = DNS_AVAILABLE
         self._whois_available = WHOIS_AVAILABLE
     
+    def _make_analyzer(self, config: AnalysisConfig) -> DomainAnalyzer:
+        """Create a DomainAnalyzer, backed by the WHOIS cache when enabled."""
+        if self.whois_cache_dir:
+            return CachedDomainAnalyzer(config, self.whois_cache_dir, self.whois_cache_ttl)
+        return DomainAnalyzer(config)
+    
     def generate_all_variants(self, domain: str) -> Set[str]:
         """
         Generate all possible homograph variants for a domain.
@@ -104,9 +511,7 @@ class HomographDomainAnalyzer:
         )
         
         generator = HomographGenerator(config)
-        variants = generator.generate_all()
-        
-        return {v.variant_domain for v in variants}
+        return {v.variant_domain for v in generator.iter_all()}
     
     def analyze_domain(
         self,
@@ -157,37 +562,17 @@ class HomographDomainAnalyzer:
             variants = variants[:max_variants]
         
         # Analyze variants
-        analyzer = DomainAnalyzer(config)
-        results = analyzer.analyze_all(variants)
+        results = self.analyze_variants(variants, config)
         
-        # Process results
-        analyzed_variants = []
-        registered_count = 0
-        high_risk_count = 0
-        medium_risk_count = 0
-        low_risk_count = 0
-        
-        unknown_risk_count = 0
+        # Sort by risk (HIGH first). trust_code grows with risk, so a
+        # descending int sort orders HIGH, MEDIUM, LOW, UNKNOWN, UNREGISTERED
+        results.sort(key=attrgetter('trust_code'), reverse=True)
         
-        for result in results:
-            variant_data = self._process_variant(result)
-            analyzed_variants.append(variant_data)
-            
-            if result.is_registered:
-                registered_count += 1
-                risk = variant_data.get('risk_level', 'UNKNOWN')
-                if risk == 'HIGH':
-                    high_risk_count += 1
-                elif risk == 'MEDIUM':
-                    medium_risk_count += 1
-                elif risk == 'LOW':
-                    low_risk_count += 1
-                elif risk == 'UNKNOWN':
-                    unknown_risk_count += 1
-        
-        # Sort by risk (HIGH first)
-        risk_order = {'HIGH': 0, 'MEDIUM': 1, 'LOW': 2, 'UNKNOWN': 3, 'UNREGISTERED': 4}
-        analyzed_variants.sort(key=lambda x: risk_order.get(x.get('risk_level', 'UNKNOWN'), 99))
+        # Process results
+        analyzed_variants = [self._process_variant(result) for result in results]
+        risk_counts = Counter(
+            v['risk_level'] for v in analyzed_variants if v['is_registered']
+        )
         
         return {
             'target_domain': domain,
@@ -196,30 +581,269 @@ class HomographDomainAnalyzer:
             'total_variants_generated': total_generated,
             'variants_analyzed': len(results),
             'summary': {
-                'registered_domains': registered_count,
-                'high_risk_count': high_risk_count,
-                'medium_risk_count': medium_risk_count,
-                'low_risk_count': low_risk_count,
-                'unknown_risk_count': unknown_risk_count,
+                'registered_domains': sum(risk_counts.values()),
+                'high_risk_count': risk_counts['HIGH'],
+                'medium_risk_count': risk_counts['MEDIUM'],
+                'low_risk_count': risk_counts['LOW'],
+                'unknown_risk_count': risk_counts['UNKNOWN'],
             },
             'analyzed_variants': analyzed_variants
         }
     
+    async def _async_resolve_batch(self, domains: List[str]) -> Dict[str, Dict[str, List[str]]]:
+        """
+        Resolve A/AAAA/MX/NS records for many domains concurrently.
+        
+        With ``dns_resolvers`` set, every query is hedged: it is sent to the
+        system resolver and to each of them at once, and the first answer
+        (or definitive NXDOMAIN/NoAnswer) wins, so one slow resolver no
+        longer costs a full timeout. By default only the system resolver is
+        queried. The semaphore is divided by the number of resolvers to keep
+        total in-flight queries at ``dns_concurrency``. Each query's deadline
+        adapts to observed latency (see _LatencyStats). Definitive answers
+        are cached on the instance for their TTL (see _DNSCache), so repeated
+        and batch runs skip names they have already resolved.
+        
+        Args:
+            domains: Domains to resolve
+            
+        Returns:
+            Mapping of each domain to its DNS records (empty if none resolved)
+        """
+        import dns.asyncresolver
+        import dns.exception
+        import dns.resolver
+        
+        resolvers = [dns.asyncresolver.Resolver(configure=True)]
+        for nameserver in self.dns_resolvers:
+            public = dns.asyncresolver.Resolver(configure=False)
+            public.nameservers = [nameserver]
+            resolvers.append(public)
+        for resolver in resolvers:
+            resolver.lifetime = self.dns_timeout
+        
+        semaphore = asyncio.Semaphore(max(1, self.dns_concurrency // len(resolvers)))
+        
+        async def hedged(domain: str, record_type: str) -> Optional[List[str]]:
+            key = (domain.lower(), record_type)
+            started = time.monotonic()
+            tasks = [
+                asyncio.ensure_future(r.resolve(domain, record_type))
+                for r in resolvers
+            ]
+            pending = set(tasks)
+            try:
+                while pending:
+                    done, pending = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in done:
+                        error = task.exception()
+                        if error is None:
+                            self._dns_latency.record(time.monotonic() - started)
+                            answer = task.result()
+                            records = [str(rdata) for rdata in answer]
+                            self._dns_cache.put(key, records, answer.rrset.ttl)
+                            return records
+                        if isinstance(error, (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer)):
+                            self._dns_latency.record(time.monotonic() - started)
+                            self._dns_cache.put(key, None, DNS_NEGATIVE_TTL)
+                            return None
+                        if not isinstance(error, (dns.resolver.NoNameservers,
+                                                  dns.exception.Timeout)):
+                            logger.debug(f"DNS error for {domain} ({record_type}): {error}")
+                return None
+            finally:
+                # Cancel the losers; ones that finished in the same round as
+                # the winner still need their exception retrieved
+                for task in tasks:
+                    if not task.done():
+                        task.cancel()
+                    elif not task.cancelled():
+                        task.exception()
+        
+        async def resolve(domain: str, record_type: str) -> Optional[List[str]]:
+            cached = self._dns_cache.get((domain.lower(), record_type))
+            if cached is not _DNSCache.MISS:
+                return cached
+            async with semaphore:
+                timeout = self._dns_latency.timeout(self.dns_timeout)
+                try:
+                    return await asyncio.wait_for(
+                        hedged(domain, record_type), timeout=timeout
+                    )
+                except asyncio.TimeoutError:
+                    remaining = self.dns_timeout - timeout
+                    if remaining <= 0:
+                        return None
+                # A slow authoritative server is not a missing name: retry
+                # once with what is left of the configured timeout, so a name
+                # never costs more than dns_timeout in total
+                try:
+                    return await asyncio.wait_for(
+                        hedged(domain, record_type), timeout=remaining
+                    )
+                except asyncio.TimeoutError:
+                    return None
+        
+        queries = [(d, rr) for d in domains for rr in DNS_RECORD_TYPES]
+        answers = await asyncio.gather(*[resolve(d, rr) for d, rr in queries])
+        
+        records: Dict[str, Dict[str, List[str]]] = {d: {} for d in domains}
+        for (domain, record_type), answer in zip(queries, answers):
+            if answer is not None:
+                records[domain][record_type] = answer
+        return records
+    
+    async def _whois_batch(
+        self,
+        domains: List[str]
+    ) -> Dict[str, Optional[Tuple[Optional[datetime], Optional[str], Dict]]]:
+        """
+        Query WHOIS for many domains concurrently over raw port-43 connections.
+        
+        Each WHOIS server gets its own semaphore so one registry (e.g. every
+        .com/.net query hitting Verisign) is never hit by more than
+        WHOIS_SERVER_CONCURRENCY connections, while different registries are
+        queried in parallel. Each server's hostname is resolved once per batch.
+        
+        Args:
+            domains: Domains whose TLD is listed in WHOIS_SERVERS
+            
+        Returns:
+            Mapping of domain to (creation_date, registrar, whois_data),
+            ``(None, None, {})`` where the registry has no such name, or
+            None where the query failed or the answer could not be parsed
+        """
+        semaphores: Dict[str, asyncio.Semaphore] = {}
+        addresses: Dict[str, asyncio.Task] = {}
+        loop = asyncio.get_running_loop()
+        
+        async def resolve_server(server: str) -> str:
+            infos = await loop.getaddrinfo(server, 43, type=socket.SOCK_STREAM)
+            return infos[0][4][0]
+        
+        async def query(server: str, domain: str) -> str:
+            # Servers close the connection after every answer (RFC 3912), so
+            # only the server's address can be reused across queries
+            if server not in addresses:
+                addresses[server] = asyncio.ensure_future(resolve_server(server))
+            address = await asyncio.shield(addresses[server])
+            return await _whois_query(address, domain)
+        
+        async def lookup(domain: str):
+            server = _whois_server_for(domain)
+            semaphore = semaphores.setdefault(
+                server, asyncio.Semaphore(WHOIS_SERVER_CONCURRENCY)
+            )
+            async with semaphore:
+                try:
+                    text = await asyncio.wait_for(
+                        query(server, domain), timeout=self.whois_timeout
+                    )
+                except (OSError, UnicodeError, asyncio.TimeoutError) as e:
+                    logger.debug(f"WHOIS error for {domain} via {server}: {e}")
+                    return None
+            return _parse_whois_response(text)
+        
+        parsed = await asyncio.gather(*[lookup(d) for d in domains])
+        return dict(zip(domains, parsed))
+    
+    def _prefetch_whois(
+        self,
+        analyzer: DomainAnalyzer,
+        variants: List[DomainVariant]
+    ) -> List[DomainVariant]:
+        """
+        Complete WHOIS analysis via _whois_batch for variants that need it
+        (see DomainAnalyzer.needs_whois).
+        
+        Variants already in the WHOIS cache are left to the analyzer, which
+        serves them from disk.
+        
+        Returns:
+            The variants that were fully analyzed here
+        """
+        cache = analyzer if isinstance(analyzer, CachedDomainAnalyzer) else None
+        pending = [
+            v for v in variants
+            if analyzer.needs_whois(v) and _whois_server_for(v.variant_domain)
+            and not (cache and cache.cached_whois(v.variant_domain))
+        ]
+        if not pending:
+            return []
+        
+        parsed = _run_coroutine(self._whois_batch([v.variant_domain for v in pending]))
+        
+        now = datetime.now()
+        done = []
+        for variant in pending:
+            whois_result = parsed[variant.variant_domain]
+            if whois_result is None:
+                # Unparseable: python-whois gets another go in analyze_all
+                continue
+            if cache:
+                # Not-found answers are stored as negative entries
+                cache.store_whois(variant.variant_domain, *whois_result)
+            analyzer.apply_whois(variant, *whois_result, now)
+            done.append(variant)
+        
+        return done
+    
+    def analyze_variants(
+        self,
+        variants: List[DomainVariant],
+        config: AnalysisConfig
+    ) -> List[DomainVariant]:
+        """
+        Run DNS and WHOIS analysis over already generated variants.
+        
+        DNS for every variant is resolved on a single event loop, WHOIS for
+        registered variants on known registries goes over async port-43
+        queries, and the threaded DomainAnalyzer handles whatever is left.
+        Variants may come from several targets (see batch_analyzer).
+        
+        Args:
+            variants: Variants to analyze (updated in place)
+            config: Analysis settings (check_dns, check_whois, threads, threshold)
+            
+        Returns:
+            The analyzed variants
+        """
+        # Resolve DNS for all variants on one event loop; the threaded
+        # analyzer then only has WHOIS left to do, which waits on the network
+        # rather than the CPU, so it gets a wider pool (per-TLD limits in
+        # DomainAnalyzer.get_whois still apply)
+        dns_resolved = False
+        if config.check_dns and ASYNC_DNS_AVAILABLE:
+            records = _run_coroutine(
+                self._async_resolve_batch([v.variant_domain for v in variants])
+            )
+            for variant in variants:
+                variant.dns_records = records[variant.variant_domain]
+                variant.is_registered = bool(variant.dns_records)
+            config = replace(
+                config, check_dns=False, threads=config.threads * WHOIS_THREAD_FACTOR
+            )
+            dns_resolved = True
+        
+        analyzer = self._make_analyzer(config)
+        
+        # Registered variants on known registries get WHOIS over async port-43
+        # queries; the rest (and any the shortcut couldn't parse) fall through
+        # to the threaded python-whois path
+        prefetched: List[DomainVariant] = []
+        if config.check_whois and dns_resolved:
+            prefetched = self._prefetch_whois(analyzer, variants)
+        if prefetched:
+            done = {id(v) for v in prefetched}
+            variants = [v for v in variants if id(v) not in done]
+        
+        return prefetched + analyzer.analyze_all(variants)
+    
     def _process_variant(self, variant: DomainVariant) -> Dict[str, Any]:
         """Process a variant result into a clean dictionary."""
-        # Map internal trust levels to simplified risk levels
-        trust_to_risk = {
-            'critical': 'HIGH',
-            'high_risk': 'HIGH',
-            'suspicious': 'HIGH',
-            'low_trust': 'MEDIUM',
-            'moderate': 'MEDIUM',
-            'established': 'LOW',
-            'unknown': 'UNKNOWN',
-            'unregistered': 'UNREGISTERED'
-        }
-        
-        risk_level = trust_to_risk.get(variant.trust_level, 'UNKNOWN')
+        risk_level = TRUST_TO_RISK[variant.trust_code]
         
         result = {
             'domain': variant.variant_domain,
@@ -260,16 +884,23 @@ class HomographDomainAnalyzer:
         Returns:
             Dictionary with registration and risk information
         """
-        config = AnalysisConfig(
-            target_domain=variant_domain,
-            trust_threshold_days=self.trust_threshold_days,
-            check_dns=True,
-            check_whois=True,
-            threads=1,
-            timeout=int(self.dns_timeout)
-        )
-        
-        analyzer = DomainAnalyzer(config)
+        # DomainAnalyzer never consults target_domain, so one analyzer (and
+        # its dns.resolver.Resolver) serves every quick_check with the same
+        # settings rather than being rebuilt per call
+        key = (self.trust_threshold_days, int(self.dns_timeout),
+               self.whois_cache_dir, self.whois_cache_ttl)
+        analyzer = self._quick_analyzers.get(key)
+        if analyzer is None:
+            config = AnalysisConfig(
+                target_domain=variant_domain,
+                trust_threshold_days=self.trust_threshold_days,
+                check_dns=not ASYNC_DNS_AVAILABLE,
+                check_whois=True,
+                threads=1,
+                timeout=int(self.dns_timeout)
+            )
+            analyzer = self._make_analyzer(config)
+            self._quick_analyzers[key] = analyzer
         
         variant = DomainVariant(
             original_domain=variant_domain,
@@ -277,6 +908,13 @@ class HomographDomainAnalyzer:
             technique='direct_check'
         )
         
+        # Send the four record queries at once (and through the DNS cache)
+        # instead of one after another in check_dns
+        if ASYNC_DNS_AVAILABLE:
+            records = _run_coroutine(self._async_resolve_batch([variant_domain]))
+            variant.dns_records = records[variant_domain]
+            variant.is_registered = bool(variant.dns_records)
+        
         result = analyzer.analyze_variant(variant)
         return self._process_variant(result)
     
@@ -327,44 +965,63 @@ class HomographDomainAnalyzer:
             format: Output format ('json' or 'csv')
         """
         if format == 'json':
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(results, f, indent=2, default=str)
+            with open(filepath, 'wb') as f:
+                dump_json(results, f)
         
         elif format == 'csv':
             import csv
-            with open(filepath, 'w', newline='', encoding='utf-8') as f:
+            rows = (
+                (
+                    v.get('domain'),
+                    v.get('technique'),
+                    v.get('is_registered'),
+                    v.get('risk_level'),
+                    v.get('age_days'),
+                    v.get('creation_date'),
+                    (v.get('whois_info') or {}).get('registrar', ''),
+                )
+                for v in results.get('analyzed_variants', [])
+            )
+            with open(filepath, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
                 writer = csv.writer(f)
                 writer.writerow([
                     'Domain', 'Technique', 'Is Registered', 'Risk Level',
                     'Age (Days)', 'Creation Date', 'Registrar'
                 ])
-                
-                for v in results.get('analyzed_variants', []):
-                    whois = v.get('whois_info', {})
-                    writer.writerow([
-                        v.get('domain'),
-                        v.get('technique'),
-                        v.get('is_registered'),
-                        v.get('risk_level'),
-                        v.get('age_days'),
-                        v.get('creation_date'),
-                        whois.get('registrar') if whois else ''
-                    ])
+                writer.writerows(rows)
     
     @staticmethod
     def get_available_techniques() -> List[str]:
         """Get list of available homograph techniques."""
-        return [
-            'homograph', 'leetspeak', 'typo', 'phonetic',
-            'repetition', 'omission', 'insertion', 'transposition',
-            'hyphenation', 'tld', 'prefix', 'suffix', 'vowel_swap',
-            'double_char', 'bitsquatting', 'subdomain'
-        ]
+        return list(TECHNIQUES)
     
     @staticmethod
     def get_homograph_mappings() -> Dict[str, List[str]]:
         """Get the Unicode homograph character mappings."""
         return HOMOGRAPH_MAPPINGS.copy()
+    
+    @staticmethod
+    def canonicalize(domain: str) -> str:
+        """Get the ASCII skeleton of a domain (see homograph_skeleton)."""
+        return homograph_skeleton(domain)
+    
+    @staticmethod
+    def is_homograph_of(domain: str, target: str) -> bool:
+        """
+        Check whether a domain is a Unicode lookalike of a target domain.
+        
+        Compares skeletons in O(len(domain)) instead of generating and
+        searching the target's variants.
+        
+        Args:
+            domain: Domain to check (Unicode or punycode)
+            target: Legitimate domain it may imitate
+            
+        Returns:
+            True if the domains differ but share a skeleton
+        """
+        return (domain.strip().rstrip('.').lower() != target.strip().rstrip('.').lower()
+                and homograph_skeleton(domain) == homograph_skeleton(target))
 
 
 # Example usage and testing
@@ -8,20 +8,26 @@ Supports reading targets from file and generating comprehensive reports.
 """
 
 import argparse
-import json
 import csv
 import sys
 import os
+import mmap
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Tuple, Any, Optional, Callable
+from dataclasses import replace
+from operator import attrgetter
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 from homograph_domain_analyzer import (
     HomographGenerator,
-    DomainAnalyzer,
     AnalysisConfig,
     DomainVariant,
+    SUSPICIOUS_TRUST_LEVELS,
+    dump_json,
+    normalize_techniques,
 )
+from analyzer_api import HomographDomainAnalyzer
 
 try:
     from rich.console import Console
@@ -34,34 +40,30 @@ except ImportError:
     RICH_AVAILABLE = False
     console = None
 
+# Unique variants handed to each analyze_variants() call in the shared pass;
+# large enough to keep the DNS event loop busy, small enough for the
+# progress bar to move
+ANALYZE_BATCH_SIZE = 1000
+
 
 def load_domains_from_file(filepath: str) -> List[str]:
     """Load domain list from file."""
-    domains = []
-    
-    with open(filepath, 'r') as f:
-        for line in f:
-            line = line.strip()
-            # Skip comments and empty lines
-            if line and not line.startswith('#'):
-                domains.append(line)
+    # mmap of an empty file is an error
+    if os.path.getsize(filepath) == 0:
+        return []
     
-    return domains
+    # Split and filter as bytes; only surviving lines are decoded
+    with open(filepath, 'rb') as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        lines = (line.strip() for line in mm[:].splitlines())
+        # Skip comments and empty lines
+        return [line.decode('utf-8') for line in lines
+                if line and not line.startswith(b'#')]
 
 
-def analyze_domain(domain: str, config_template: Dict[str, Any]) -> Dict[str, Any]:
-    """
-    Analyze a single domain and return results.
-    
-    Args:
-        domain: Target domain to analyze
-        config_template: Configuration template
-        
-    Returns:
-        Analysis results dictionary
-    """
-    # Create config for this domain
-    config = AnalysisConfig(
+def _make_config(domain: str, config_template: Dict[str, Any]) -> AnalysisConfig:
+    """Create the AnalysisConfig for a target from the shared template."""
+    return AnalysisConfig(
         target_domain=domain,
         trust_threshold_days=config_template.get('trust_threshold_days', 730),
         max_variants=config_template.get('max_variants', 500),
@@ -71,26 +73,147 @@ def analyze_domain(domain: str, config_template: Dict[str, Any]) -> Dict[str, An
         timeout=config_template.get('timeout', 5),
         techniques=config_template.get('techniques', ['all']),
     )
+
+
+def generate_variants(domain: str, config_template: Dict[str, Any]) -> List[DomainVariant]:
+    """Generate (but do not analyze) the variants for a single target."""
+    generator = HomographGenerator(_make_config(domain, config_template))
+    return generator.generate_all()
+
+
+def generate_all_targets(
+    domains: List[str],
+    config_template: Dict[str, Any],
+    on_target: Optional[Callable[[int, str], None]] = None
+) -> Tuple[List[Tuple[str, List[DomainVariant]]], Dict[str, str]]:
+    """
+    Generate variants for every target, spread across worker processes.
+    
+    Variant generation is pure-Python CPU work, so targets are generated in
+    a process pool rather than threads. A single target is generated inline
+    to avoid the pool start-up cost.
+    
+    Args:
+        domains: Target domains
+        config_template: Configuration template
+        on_target: Called with (1-based index, domain) as each target finishes
+        
+    Returns:
+        (target domain, variants) pairs in input order, and a mapping of
+        target domain to error message for targets that failed
+    """
+    variants_by_target: List[Tuple[str, List[DomainVariant]]] = []
+    errors: Dict[str, str] = {}
+    
+    if len(domains) <= 1:
+        for i, domain in enumerate(domains, 1):
+            try:
+                variants_by_target.append((domain, generate_variants(domain, config_template)))
+            except Exception as e:
+                errors[domain] = str(e)
+            if on_target:
+                on_target(i, domain)
+        return variants_by_target, errors
+    
+    with ProcessPoolExecutor(max_workers=min(len(domains), os.cpu_count() or 1)) as pool:
+        futures = [pool.submit(generate_variants, d, config_template) for d in domains]
+        for i, (domain, future) in enumerate(zip(domains, futures), 1):
+            try:
+                variants_by_target.append((domain, future.result()))
+            except Exception as e:
+                errors[domain] = str(e)
+            if on_target:
+                on_target(i, domain)
+    
+    return variants_by_target, errors
+
+
+def analyze_unique_variants(
+    variants_by_target: List[Tuple[str, List[DomainVariant]]],
+    config_template: Dict[str, Any],
+    on_batch: Optional[Callable[[int, int], None]] = None
+) -> Dict[str, DomainVariant]:
+    """
+    Analyze every distinct variant domain exactly once.
+    
+    Targets frequently share variants (TLD swaps, bitsquats of common
+    substrings), so DNS/WHOIS runs over the union of all targets' variants,
+    ANALYZE_BATCH_SIZE variants at a time.
+    
+    Args:
+        variants_by_target: (target domain, generated variants) pairs
+        config_template: Configuration template
+        on_batch: Called with (variants analyzed so far, unique total)
+            after each batch
+        
+    Returns:
+        Mapping of variant domain to its analyzed DomainVariant
+    """
+    unique: Dict[str, DomainVariant] = {}
+    for _, variants in variants_by_target:
+        for variant in variants:
+            unique.setdefault(variant.variant_domain, variant)
+    
+    if not unique:
+        return {}
+    
+    # One async DNS/WHOIS pass for all targets, sharing the on-disk WHOIS cache
+    config = _make_config(variants_by_target[0][0], config_template)
+    analyzer = HomographDomainAnalyzer(
+        dns_timeout=config.timeout,
+        max_workers=config.threads
+    )
+    pending = list(unique.values())
+    for start in range(0, len(pending), ANALYZE_BATCH_SIZE):
+        batch = pending[start:start + ANALYZE_BATCH_SIZE]
+        analyzer.analyze_variants(batch, config)
+        if on_batch:
+            on_batch(start + len(batch), len(pending))
     
-    # Generate variants
-    generator = HomographGenerator(config)
-    variants = generator.generate_all()
+    return unique
+
+
+def build_domain_result(
+    domain: str,
+    variants: List[DomainVariant],
+    analyzed: Dict[str, DomainVariant],
+    analysis_timestamp: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Build the report for one target from the shared analysis results.
     
-    # Analyze variants
-    analyzer = DomainAnalyzer(config)
-    results = analyzer.analyze_all(variants)
+    Args:
+        domain: Target domain
+        variants: Variants generated for this target
+        analyzed: Shared analysis results keyed by variant domain
+        analysis_timestamp: ISO timestamp of the run (default: now)
+        
+    Returns:
+        Analysis results dictionary
+    """
+    results = []
+    for variant in variants:
+        shared = analyzed[variant.variant_domain]
+        if shared is not variant:
+            # Keep this target's own generation metadata
+            shared = replace(
+                shared,
+                original_domain=variant.original_domain,
+                technique=variant.technique,
+                technique_detail=variant.technique_detail,
+            )
+        results.append(shared)
     
     # Filter and sort results
     registered = [r for r in results if r.is_registered]
-    registered.sort(key=lambda x: x.risk_score, reverse=True)
+    registered.sort(key=attrgetter('risk_score'), reverse=True)
     
     # Categorize by trust level
-    suspicious = [r for r in registered if r.trust_level in 
-                  ['critical', 'high_risk', 'suspicious', 'low_trust']]
+    suspicious = [r for r in registered if r.trust_level in SUSPICIOUS_TRUST_LEVELS]
     
     return {
         'target_domain': domain,
-        'analysis_timestamp': datetime.now().isoformat(),
+        'analysis_timestamp': analysis_timestamp or datetime.now().isoformat(),
         'summary': {
             'total_variants_generated': len(results),
             'registered_count': len(registered),
@@ -103,6 +226,22 @@ def analyze_domain(domain: str, config_template: Dict[str, Any]) -> Dict[str, An
     }
 
 
+def analyze_domain(domain: str, config_template: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Analyze a single domain and return results.
+    
+    Args:
+        domain: Target domain to analyze
+        config_template: Configuration template
+        
+    Returns:
+        Analysis results dictionary
+    """
+    variants = generate_variants(domain, config_template)
+    analyzed = analyze_unique_variants([(domain, variants)], config_template)
+    return build_domain_result(domain, variants, analyzed)
+
+
 def generate_summary_report(all_results: List[Dict], output_file: str):
     """Generate a summary report of all analyzed domains."""
     
@@ -138,8 +277,8 @@ def generate_summary_report(all_results: List[Dict], output_file: str):
     }
     
     # Write report
-    with open(output_file, 'w') as f:
-        json.dump(report, f, indent=2, default=str)
+    with open(output_file, 'wb') as f:
+        dump_json(report, f)
     
     return report
 
@@ -215,7 +354,8 @@ def main():
         'check_whois': not args.no_whois,
         'threads': args.threads,
         'timeout': 5,
-        'techniques': args.techniques.split(','),
+        # Resolved once here rather than re-parsed for every target
+        'techniques': normalize_techniques(args.techniques.split(',')),
     }
     
     print(f"\n{'='*60}")
@@ -226,8 +366,6 @@ def main():
     print(f"Max variants per domain: {args.max_variants}")
     print(f"{'='*60}\n")
     
-    all_results = []
-    
     if RICH_AVAILABLE:
         with Progress(
             SpinnerColumn(),
@@ -237,43 +375,67 @@ def main():
             console=console
         ) as progress:
             task = progress.add_task(
-                "[cyan]Analyzing domains...", total=len(domains)
+                "[cyan]Generating variants...", total=len(domains)
+            )
+            
+            # Pass 1: generate variants for every target
+            variants_by_target, errors = generate_all_targets(
+                domains, config_template,
+                on_target=lambda i, domain: progress.update(
+                    task, completed=i, description=f"[cyan]Generated {domain}"
+                )
             )
             
-            for domain in domains:
-                progress.update(task, description=f"[cyan]Analyzing {domain}...")
-                try:
-                    result = analyze_domain(domain, config_template)
-                    all_results.append(result)
-                    
-                    # Print quick summary
-                    console.print(
-                        f"  [green]✓[/green] {domain}: "
-                        f"{result['summary']['registered_count']} registered, "
-                        f"[red]{result['summary']['suspicious_count']} suspicious[/red]"
-                    )
-                except Exception as e:
-                    console.print(f"  [red]✗[/red] {domain}: Error - {e}")
-                    all_results.append({
-                        'target_domain': domain,
-                        'error': str(e)
-                    })
-                
-                progress.advance(task)
+            # Pass 2: resolve each unique variant once, then fan back out per target
+            progress.reset(task, description="[cyan]Analyzing variants...")
+            analyzed = analyze_unique_variants(
+                variants_by_target, config_template,
+                on_batch=lambda done, total: progress.update(task, completed=done, total=total)
+            )
     else:
-        for i, domain in enumerate(domains, 1):
-            print(f"[{i}/{len(domains)}] Analyzing {domain}...")
-            try:
-                result = analyze_domain(domain, config_template)
-                all_results.append(result)
-                print(f"  ✓ {result['summary']['registered_count']} registered, "
-                      f"{result['summary']['suspicious_count']} suspicious")
-            except Exception as e:
-                print(f"  ✗ Error: {e}")
-                all_results.append({
-                    'target_domain': domain,
-                    'error': str(e)
-                })
+        variants_by_target, errors = generate_all_targets(
+            domains, config_template,
+            on_target=lambda i, domain: print(f"[{i}/{len(domains)}] Generated {domain}")
+        )
+        analyzed = analyze_unique_variants(
+            variants_by_target, config_template,
+            on_batch=lambda done, total: print(f"Analyzed {done}/{total} variants")
+        )
+    
+    total = sum(len(v) for _, v in variants_by_target)
+    print(f"\nGenerated {total} variants ({len(analyzed)} unique across targets)\n")
+    
+    generated = dict(variants_by_target)
+    # All targets were analyzed in the same pass, so they share one timestamp
+    analysis_timestamp = datetime.now().isoformat()
+    
+    all_results = []
+    
+    for domain in domains:
+        if domain in errors:
+            if RICH_AVAILABLE:
+                console.print(f"  [red]✗[/red] {domain}: Error - {errors[domain]}")
+            else:
+                print(f"  ✗ {domain}: Error - {errors[domain]}")
+            all_results.append({
+                'target_domain': domain,
+                'error': errors[domain]
+            })
+            continue
+        
+        result = build_domain_result(domain, generated[domain], analyzed, analysis_timestamp)
+        all_results.append(result)
+        
+        # Print quick summary
+        if RICH_AVAILABLE:
+            console.print(
+                f"  [green]✓[/green] {domain}: "
+                f"{result['summary']['registered_count']} registered, "
+                f"[red]{result['summary']['suspicious_count']} suspicious[/red]"
+            )
+        else:
+            print(f"  ✓ {domain}: {result['summary']['registered_count']} registered, "
+                  f"{result['summary']['suspicious_count']} suspicious")
     
     # Generate report
     print(f"\nGenerating report: {args.output}")
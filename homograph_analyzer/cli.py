@@ -6,23 +6,55 @@ This module provides a user-friendly CLI for analyzing homograph domains.
 """
 
 import argparse
+import itertools
 import sys
-import json
 from pathlib import Path
 from datetime import datetime
 
 from analyzer_api import HomographDomainAnalyzer
+from homograph_domain_analyzer import dump_json
 
 
-def print_banner():
-    """Print application banner."""
-    banner = """
+# Display order of risk levels (anything else comes last)
+RISK_ORDER = ('HIGH', 'MEDIUM', 'LOW', 'UNKNOWN')
+
+# Console marker per risk level
+RISK_ICONS = {
+    'HIGH': '[!!!]',
+    'MEDIUM': '[!!]',
+    'LOW': '[*]',
+    'UNKNOWN': '[?]'
+}
+
+# HTML report badge class per risk level
+_BADGE_CLASSES = {risk: f"badge-{risk.lower()}" for risk in ('HIGH', 'MEDIUM', 'LOW')}
+
+# Application banner as print_banner writes it
+_BANNER = """
     ╔═══════════════════════════════════════════════════════════════╗
     ║           HOMOGRAPH DOMAIN ANALYZER v1.0.0                    ║
     ║   Detect potentially malicious look-alike domains            ║
     ╚═══════════════════════════════════════════════════════════════╝
+    \n"""
+
+
+def bucket_by_risk(variants: list) -> dict:
     """
-    print(banner)
+    Group analyzed variants by risk level in a single pass.
+    
+    Buckets for RISK_ORDER levels come first, in that order, followed by any
+    other level; each keeps the variants' original order, so chaining the
+    buckets' values gives the variants ordered by risk.
+    """
+    buckets = {level: [] for level in RISK_ORDER}
+    for variant in variants:
+        buckets.setdefault(variant.get('risk_level', 'UNKNOWN'), []).append(variant)
+    return buckets
+
+
+def print_banner():
+    """Print application banner."""
+    sys.stdout.write(_BANNER)
 
 
 def analyze_single_domain(args):
@@ -37,7 +69,8 @@ def analyze_single_domain(args):
         trust_threshold_years=args.threshold,
         dns_timeout=args.dns_timeout,
         whois_timeout=args.whois_timeout,
-        max_workers=args.workers
+        max_workers=args.workers,
+        dns_concurrency=args.dns_concurrency
     )
     
     # Generate variants
@@ -45,9 +78,9 @@ def analyze_single_domain(args):
     variants = analyzer.generate_all_variants(args.domain)
     print(f"[+] Generated {len(variants)} potential variants")
     
+    # analyze_domain applies the limit itself (generation stops at the cap)
     if args.max_variants and len(variants) > args.max_variants:
         print(f"[!] Limiting to {args.max_variants} variants for analysis")
-        variants = list(variants)[:args.max_variants]
     
     # Analyze variants
     print("\n[*] Analyzing variants (this may take a while)...")
@@ -59,17 +92,18 @@ def analyze_single_domain(args):
     )
     
     # Display results
-    display_results(results, args)
+    buckets = bucket_by_risk(results.get('analyzed_variants', []))
+    display_results(results, args, buckets)
     
     # Export if requested
     if args.output:
-        export_results(results, args.output, args.format)
+        export_results(results, args.output, args.format, buckets)
     
     return results
 
 
-def display_results(results: dict, args):
-    """Display analysis results."""
+def display_results(results: dict, args, buckets: dict = None):
+    """Display analysis results (buckets: precomputed bucket_by_risk result)."""
     print("\n" + "=" * 60)
     print("ANALYSIS RESULTS")
     print("=" * 60)
@@ -96,43 +130,38 @@ def display_results(results: dict, args):
         print("\n[!] No registered variants found.")
         return
     
-    # Sort by risk level
-    risk_order = {'HIGH': 0, 'MEDIUM': 1, 'LOW': 2, 'UNKNOWN': 3}
-    analyzed_sorted = sorted(
-        analyzed,
-        key=lambda x: risk_order.get(x.get('risk_level', 'UNKNOWN'), 99)
-    )
+    # Group by risk level
+    if buckets is None:
+        buckets = bucket_by_risk(analyzed)
     
     # Display high-risk domains
-    high_risk = [v for v in analyzed_sorted if v.get('risk_level') == 'HIGH']
+    high_risk = buckets['HIGH']
     if high_risk:
         print("\n" + "-" * 60)
         print("HIGH RISK DOMAINS (Potential Phishing/Impersonation)")
         print("-" * 60)
-        for variant in high_risk:
-            print_variant_details(variant, verbose=args.verbose)
+        print_variants(high_risk, verbose=args.verbose)
     
     # Display medium-risk domains
-    medium_risk = [v for v in analyzed_sorted if v.get('risk_level') == 'MEDIUM']
+    medium_risk = buckets['MEDIUM']
     if medium_risk:
         print("\n" + "-" * 60)
         print("MEDIUM RISK DOMAINS")
         print("-" * 60)
-        for variant in medium_risk:
-            print_variant_details(variant, verbose=args.verbose)
+        print_variants(medium_risk, verbose=args.verbose)
     
     # Display low-risk domains (only in verbose mode)
     if args.verbose:
-        low_risk = [v for v in analyzed_sorted if v.get('risk_level') == 'LOW']
+        low_risk = buckets['LOW']
         if low_risk:
             print("\n" + "-" * 60)
             print("LOW RISK DOMAINS (Established)")
             print("-" * 60)
-            for variant in low_risk:
-                print_variant_details(variant, verbose=True)
+            print_variants(low_risk, verbose=True)
     
-    # Display unknown risk domains (registered but WHOIS failed)
-    unknown_risk = [v for v in analyzed_sorted if v.get('risk_level') == 'UNKNOWN' and v.get('is_registered')]
+    # Display unknown risk domains (registered but WHOIS failed); the UNKNOWN
+    # bucket also holds unregistered variants, so it is the one left to filter
+    unknown_risk = [v for v in buckets['UNKNOWN'] if v.get('is_registered')]
     if unknown_risk:
         print("\n" + "-" * 60)
         print(f"REGISTERED DOMAINS - WHOIS UNAVAILABLE ({len(unknown_risk)} domains)")
@@ -141,72 +170,80 @@ def display_results(results: dict, args):
         print("[!] They may require manual investigation.\n")
         # Show first 20 by default, all if verbose
         display_limit = len(unknown_risk) if args.verbose else min(20, len(unknown_risk))
-        for variant in unknown_risk[:display_limit]:
-            print_variant_details(variant, verbose=args.verbose)
+        print_variants(itertools.islice(unknown_risk, display_limit), verbose=args.verbose)
         if not args.verbose and len(unknown_risk) > 20:
             print(f"\n[...] {len(unknown_risk) - 20} more domains. Use --verbose to show all.")
 
 
-def print_variant_details(variant: dict, verbose: bool = False):
-    """Print details for a single variant."""
+def format_variant_details(variant: dict, verbose: bool = False) -> list:
+    """Format details for a single variant as a list of output lines."""
     domain = variant.get('domain', 'Unknown')
     technique = variant.get('technique', 'Unknown')
     risk = variant.get('risk_level', 'UNKNOWN')
     age_days = variant.get('age_days')
     creation_date = variant.get('creation_date')
     
-    risk_icons = {
-        'HIGH': '[!!!]',
-        'MEDIUM': '[!!]',
-        'LOW': '[*]',
-        'UNKNOWN': '[?]'
-    }
-    
-    print(f"\n{risk_icons.get(risk, '[?]')} {domain}")
-    print(f"    Technique: {technique}")
+    lines = [f"\n{RISK_ICONS.get(risk, '[?]')} {domain}"]
+    lines.append(f"    Technique: {technique}")
     
     if creation_date:
-        print(f"    Created: {creation_date}")
+        lines.append(f"    Created: {creation_date}")
     
     if age_days is not None:
         years = age_days / 365.25
-        print(f"    Age: {age_days} days ({years:.1f} years)")
+        lines.append(f"    Age: {age_days} days ({years:.1f} years)")
     
     if verbose:
         # DNS Information
         dns_info = variant.get('dns_info', {})
         if dns_info:
             if dns_info.get('a_records'):
-                print(f"    A Records: {', '.join(dns_info['a_records'][:3])}")
+                lines.append(f"    A Records: {', '.join(dns_info['a_records'][:3])}")
             if dns_info.get('mx_records'):
-                print(f"    MX Records: {', '.join(dns_info['mx_records'][:2])}")
+                lines.append(f"    MX Records: {', '.join(dns_info['mx_records'][:2])}")
             if dns_info.get('ns_records'):
-                print(f"    NS Records: {', '.join(dns_info['ns_records'][:2])}")
+                lines.append(f"    NS Records: {', '.join(dns_info['ns_records'][:2])}")
         
         # WHOIS Information
         whois_info = variant.get('whois_info', {})
         if whois_info:
             registrar = whois_info.get('registrar')
             if registrar:
-                print(f"    Registrar: {registrar}")
+                lines.append(f"    Registrar: {registrar}")
             expiry = whois_info.get('expiration_date')
             if expiry:
-                print(f"    Expires: {expiry}")
+                lines.append(f"    Expires: {expiry}")
+    
+    return lines
 
 
-def export_results(results: dict, output_path: str, format_type: str):
-    """Export results to file."""
+def print_variant_details(variant: dict, verbose: bool = False):
+    """Print details for a single variant."""
+    print('\n'.join(format_variant_details(variant, verbose)))
+
+
+def print_variants(variants, verbose: bool = False):
+    """Print details for several variants with a single write to stdout."""
+    lines = []
+    for variant in variants:
+        lines.extend(format_variant_details(variant, verbose))
+    if lines:
+        sys.stdout.write('\n'.join(lines) + '\n')
+
+
+def export_results(results: dict, output_path: str, format_type: str, buckets: dict = None):
+    """Export results to file (buckets: precomputed bucket_by_risk result)."""
     output_file = Path(output_path)
     
     if format_type == 'json':
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, default=str)
+        with open(output_file, 'wb') as f:
+            dump_json(results, f)
         print(f"\n[+] Results exported to: {output_file}")
     
     elif format_type == 'csv':
         import csv
         
-        with open(output_file, 'w', newline='', encoding='utf-8') as f:
+        with open(output_file, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
             writer = csv.writer(f)
             
             # Header
@@ -215,32 +252,30 @@ def export_results(results: dict, output_path: str, format_type: str):
                 'Creation Date', 'Age (Days)', 'Registrar', 'A Records'
             ])
             
-            # Data rows
-            for variant in results.get('analyzed_variants', []):
-                dns_info = variant.get('dns_info', {})
-                whois_info = variant.get('whois_info', {})
-                
-                writer.writerow([
+            # Data rows, written by the csv module in one batch
+            writer.writerows(
+                (
                     variant.get('domain', ''),
                     variant.get('technique', ''),
                     variant.get('risk_level', ''),
                     variant.get('is_registered', False),
                     variant.get('creation_date', ''),
                     variant.get('age_days', ''),
-                    whois_info.get('registrar', ''),
-                    '; '.join(dns_info.get('a_records', []))
-                ])
+                    variant.get('whois_info', {}).get('registrar', ''),
+                    '; '.join(variant.get('dns_info', {}).get('a_records', []))
+                )
+                for variant in results.get('analyzed_variants', [])
+            )
         
         print(f"\n[+] Results exported to: {output_file}")
     
     elif format_type == 'html':
-        export_html_report(results, output_file)
+        export_html_report(results, output_file, buckets)
         print(f"\n[+] HTML report exported to: {output_file}")
 
 
-def export_html_report(results: dict, output_file: Path):
-    """Generate an HTML report."""
-    html_template = """
+# HTML report page; table rows are streamed in between the two halves
+_HTML_TEMPLATE = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -345,23 +380,39 @@ def export_html_report(results: dict, output_file: Path):
 </body>
 </html>
     """
-    
-    # Generate table rows
-    rows = []
-    risk_order = {'HIGH': 0, 'MEDIUM': 1, 'LOW': 2, 'UNKNOWN': 3}
-    variants = sorted(
-        results.get('analyzed_variants', []),
-        key=lambda x: risk_order.get(x.get('risk_level', 'UNKNOWN'), 99)
-    )
-    
-    for v in variants:
-        risk = v.get('risk_level', 'UNKNOWN')
-        badge_class = f"badge-{risk.lower()}" if risk in ['HIGH', 'MEDIUM', 'LOW'] else ''
-        age_days = v.get('age_days')
-        age_str = f"{age_days} days" if age_days else 'N/A'
-        whois = v.get('whois_info', {})
+_HTML_HEAD, _HTML_TAIL = _HTML_TEMPLATE.split('{table_rows}')
+_HTML_TAIL = _HTML_TAIL.format()  # only escaped braces, resolve them once
+
+
+def export_html_report(results: dict, output_file: Path, buckets: dict = None):
+    """Generate an HTML report (buckets: precomputed bucket_by_risk result)."""
+    # Stream the report: everything before the table rows, one row per
+    # variant, then the closing markup, without building the whole page
+    summary = results.get('summary', {})
+    if buckets is None:
+        buckets = bucket_by_risk(results.get('analyzed_variants', []))
+    variants = itertools.chain.from_iterable(buckets.values())
+    
+    with open(output_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+        f.write(_HTML_HEAD.format(
+            target_domain=results.get('target_domain', 'Unknown'),
+            timestamp=results.get('analysis_timestamp', datetime.now().isoformat()),
+            threshold=results.get('trust_threshold_years', 2),
+            total_variants=results.get('total_variants_generated', 0),
+            registered_count=summary.get('registered_domains', 0),
+            high_risk=summary.get('high_risk_count', 0),
+            medium_risk=summary.get('medium_risk_count', 0),
+            low_risk=summary.get('low_risk_count', 0),
+        ))
         
-        rows.append(f"""
+        for v in variants:
+            risk = v.get('risk_level', 'UNKNOWN')
+            badge_class = _BADGE_CLASSES.get(risk, '')
+            age_days = v.get('age_days')
+            age_str = f"{age_days} days" if age_days else 'N/A'
+            whois = v.get('whois_info', {})
+            
+            f.write(f"""
             <tr>
                 <td><span class="badge {badge_class}">{risk}</span></td>
                 <td class="domain">{v.get('domain', '')}</td>
@@ -371,23 +422,8 @@ def export_html_report(results: dict, output_file: Path):
                 <td>{whois.get('registrar', 'N/A')}</td>
             </tr>
         """)
-    
-    summary = results.get('summary', {})
-    
-    html = html_template.format(
-        target_domain=results.get('target_domain', 'Unknown'),
-        timestamp=results.get('analysis_timestamp', datetime.now().isoformat()),
-        threshold=results.get('trust_threshold_years', 2),
-        total_variants=results.get('total_variants_generated', 0),
-        registered_count=summary.get('registered_domains', 0),
-        high_risk=summary.get('high_risk_count', 0),
-        medium_risk=summary.get('medium_risk_count', 0),
-        low_risk=summary.get('low_risk_count', 0),
-        table_rows=''.join(rows)
-    )
-    
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(html)
+        
+        f.write(_HTML_TAIL)
 
 
 def analyze_batch(args):
@@ -460,6 +496,8 @@ For batch processing, use:
                                 help='Show detailed output')
     analyze_parser.add_argument('-w', '--workers', type=int, default=10,
                                 help='Number of concurrent workers (default: 10)')
+    analyze_parser.add_argument('--dns-concurrency', type=int, default=500,
+                                help='Maximum in-flight async DNS queries (default: 500)')
     analyze_parser.add_argument('--dns-timeout', type=float, default=5.0,
                                 help='DNS query timeout in seconds (default: 5)')
     analyze_parser.add_argument('--whois-timeout', type=float, default=10.0,
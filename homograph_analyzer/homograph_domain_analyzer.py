@@ -18,6 +18,8 @@ Author: Security Research Tool
 License: MIT
 """
 
+import io
+import os
 import re
 import sys
 import json
@@ -26,51 +28,59 @@ import argparse
 import logging
 import csv
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Set, Tuple, Any
-from dataclasses import dataclass, field, asdict
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Set, Tuple, Any, Iterable, Iterator, FrozenSet, TextIO
+from dataclasses import dataclass, field
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from itertools import product
-import time
+from functools import lru_cache
+from operator import attrgetter
+from importlib.util import find_spec
+import threading
 
-# Third-party imports
-try:
-    import whois
-    WHOIS_AVAILABLE = True
-except ImportError:
-    WHOIS_AVAILABLE = False
+
+def _module_available(name: str) -> bool:
+    """Check whether a module can be imported, without importing it."""
+    try:
+        return find_spec(name) is not None
+    except ImportError:
+        return False
+
+
+# Third-party imports. Availability is checked up front, but the heavy
+# modules are only imported where they are first used, so entry points that
+# never touch them (--help, listing techniques) skip their import cost.
+WHOIS_AVAILABLE = _module_available('whois')
+if not WHOIS_AVAILABLE:
     print("Warning: python-whois not installed. WHOIS lookups will be disabled.")
 
-try:
-    import dns.resolver
-    DNS_AVAILABLE = True
-except ImportError:
-    DNS_AVAILABLE = False
+DNS_AVAILABLE = _module_available('dns.resolver')
+if not DNS_AVAILABLE:
     print("Warning: dnspython not installed. Using basic socket lookup.")
 
-try:
-    from confusable_homoglyphs import confusables
-    CONFUSABLES_AVAILABLE = True
-except ImportError:
-    CONFUSABLES_AVAILABLE = False
+CONFUSABLES_AVAILABLE = _module_available('confusable_homoglyphs')
+if not CONFUSABLES_AVAILABLE:
     print("Warning: confusable_homoglyphs not installed. Using built-in mappings.")
 
-try:
-    from rich.console import Console
-    from rich.table import Table
-    from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
-    from rich.panel import Panel
-    from rich import print as rprint
-    RICH_AVAILABLE = True
-    console = Console()
-except ImportError:
-    RICH_AVAILABLE = False
-    console = None
+RICH_AVAILABLE = _module_available('rich')
+_console = None
+
+
+def _get_console():
+    """Get the shared rich Console, importing rich on first use."""
+    global _console
+    if _console is None:
+        from rich.console import Console
+        _console = Console()
+    return _console
+
+
+TLDEXTRACT_AVAILABLE = _module_available('tldextract')
 
 try:
-    import tldextract
-    TLDEXTRACT_AVAILABLE = True
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    TLDEXTRACT_AVAILABLE = False
+    ORJSON_AVAILABLE = False
 
 
 # Configure logging
@@ -226,6 +236,18 @@ ALTERNATIVE_TLDS: List[str] = [
     'best', 'win', 'vip', 'ltd', 'group', 'company', 'solutions',
 ]
 
+# Simultaneous WHOIS lookups per TLD; each TLD is served by one registry,
+# which is what rate-limits (DNS goes to the resolver and is not throttled)
+WHOIS_TLD_CONCURRENCY = 4
+
+# Resolver settings: answers cached per DomainAnalyzer, and EDNS0 with the
+# DNS Flag Day payload size so larger answers do not fall back to TCP
+DNS_RESOLVER_CACHE_SIZE = 10000
+DNS_EDNS_PAYLOAD = 1232
+
+# Variants in flight per worker thread in DomainAnalyzer.iter_analyzed
+ANALYSIS_WINDOW_PER_THREAD = 4
+
 # Prefixes and suffixes commonly used in phishing
 PHISHING_PREFIXES: List[str] = [
     'www-', 'www.', 'login-', 'signin-', 'secure-', 'account-', 'my-',
@@ -240,12 +262,125 @@ PHISHING_SUFFIXES: List[str] = [
     '-security', '-center', '-team', '-group', '-inc', '-corp', '-ltd',
 ]
 
+# Per-character substitutions exactly as the generators consume them, cut to
+# each technique's per-character limit once here instead of sliced on every
+# lookup. Names are lowercased before generation, so uppercase keys never match.
+_HOMOGRAPH_SUBS: Dict[str, Tuple[str, ...]] = {
+    char: tuple(repls[:3]) for char, repls in HOMOGRAPH_MAPPINGS.items()
+    if char.islower()
+}
+_LEETSPEAK_SUBS: Dict[str, Tuple[str, ...]] = {
+    char: tuple(repls) for char, repls in LEETSPEAK_MAPPINGS.items()
+}
+_TYPO_SUBS: Dict[str, Tuple[str, ...]] = {
+    char: tuple(repls[:2]) for char, repls in KEYBOARD_TYPOS.items()
+}
+
+
+def _affix_pairs(affixes: Iterable[str], strip: str, leading: bool) -> Tuple[Tuple[str, str], ...]:
+    """Pair each affix with its stripped form, keeping the first affix per form."""
+    pairs: Dict[str, str] = {}
+    for affix in affixes:
+        clean = affix.lstrip(strip) if leading else affix.rstrip(strip)
+        pairs.setdefault(clean, affix)
+    return tuple((affix, clean) for clean, affix in pairs.items())
+
+
+# (affix, affix as joined to the name), stripped once rather than per target.
+# Affixes that strip to an earlier one's form ('www-' and 'www.') are dropped,
+# as _add_variant would reject their variant as a duplicate anyway
+_CLEAN_PREFIXES = _affix_pairs(PHISHING_PREFIXES, '-.', leading=False)
+_CLEAN_SUFFIXES = _affix_pairs(PHISHING_SUFFIXES, '-', leading=True)
+
+# Lowercase letters one bit flip away from each character, in bit order;
+# characters above U+00FF cannot flip into a-z
+_BIT_FLIPS: Dict[str, Tuple[str, ...]] = {
+    chr(code): tuple(
+        chr(code ^ (1 << bit)) for bit in range(8)
+        if 97 <= code ^ (1 << bit) <= 122
+    )
+    for code in range(256)
+}
+
+# Replacements for each vowel in vowel-swap variants
+_VOWEL_SWAPS: Dict[str, Tuple[str, ...]] = {
+    vowel: tuple(other for other in 'aeiou' if other != vowel) for vowel in 'aeiou'
+}
+
+
+def _by_code(table: Dict[str, Tuple[str, ...]]) -> Tuple[Tuple[Tuple[str, int], ...], ...]:
+    """Index an ASCII substitution table by code point, pairing each replacement with its byte."""
+    return tuple(
+        tuple((repl, ord(repl)) for repl in table.get(chr(code), ()))
+        for code in range(128)
+    )
+
+
+# The ASCII substitution tables indexed by code point, for ASCII names
+_LEETSPEAK_BY_CODE = _by_code(_LEETSPEAK_SUBS)
+_TYPO_BY_CODE = _by_code(_TYPO_SUBS)
+_VOWEL_SWAPS_BY_CODE = _by_code(_VOWEL_SWAPS)
+_BIT_FLIPS_BY_CODE = _by_code(_BIT_FLIPS)
+
+# Reverse of HOMOGRAPH_MAPPINGS: every single-character lookalike back to the
+# ASCII letter it imitates. Multi-character lookalikes ('rn', 'vv') are left
+# out since they also occur legitimately.
+_SKELETON_TABLE = str.maketrans({
+    repl: char
+    for char, repls in HOMOGRAPH_MAPPINGS.items() if char.islower()
+    for repl in repls if len(repl) == 1 and repl != char
+})
+
+# Variant generation techniques, in the order generate_all runs them
+TECHNIQUES: Tuple[str, ...] = (
+    'homograph', 'leetspeak', 'typo', 'phonetic',
+    'repetition', 'omission', 'insertion', 'transposition',
+    'hyphenation', 'tld', 'prefix', 'suffix', 'vowel_swap',
+    'double_char', 'bitsquatting', 'subdomain',
+)
+TECHNIQUE_SET: FrozenSet[str] = frozenset(TECHNIQUES)
+
+# Trust levels ordered by increasing risk; DomainVariant.trust_code indexes this
+TRUST_LEVELS: Tuple[str, ...] = (
+    'unregistered', 'unknown', 'established', 'moderate',
+    'low_trust', 'suspicious', 'high_risk', 'critical',
+)
+TRUST_CODES: Dict[str, int] = {level: code for code, level in enumerate(TRUST_LEVELS)}
+
+# Trust levels reported as suspicious/low-trust in summaries
+SUSPICIOUS_TRUST_LEVELS: FrozenSet[str] = frozenset({
+    'critical', 'high_risk', 'suspicious', 'low_trust',
+})
+
+# Trust levels that make main() exit with status 2
+HIGH_RISK_TRUST_LEVELS: FrozenSet[str] = frozenset({
+    'critical', 'high_risk', 'suspicious',
+})
+
+# WHOIS fields kept on a variant
+_WHOIS_KEPT_FIELDS: FrozenSet[str] = frozenset({
+    'domain_name', 'registrar', 'creation_date',
+    'expiration_date', 'name_servers', 'org', 'country',
+})
+
+# Rich style for each trust level in the console table
+_RISK_STYLES: Dict[str, str] = {
+    'critical': 'red bold',
+    'high_risk': 'red',
+    'suspicious': 'yellow',
+    'low_trust': 'yellow dim',
+    'moderate': 'green dim',
+    'established': 'green',
+    'unknown': 'dim',
+    'unregistered': 'dim'
+}
+
 
 # ============================================================================
 # DATA CLASSES
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class DomainVariant:
     """Represents a generated domain variant with analysis results."""
     original_domain: str
@@ -259,18 +394,39 @@ class DomainVariant:
     registrar: Optional[str] = None
     domain_age_days: Optional[int] = None
     trust_level: str = "unknown"  # low, medium, high, unknown
+    # Index into TRUST_LEVELS for sorting; internal, so kept out of to_dict()
+    trust_code: int = field(default=TRUST_CODES['unknown'], repr=False)
     risk_score: int = 0  # 0-100
     error: Optional[str] = None
     
     def to_dict(self) -> Dict:
-        """Convert to dictionary for JSON serialization."""
-        data = asdict(self)
-        if data['creation_date']:
-            data['creation_date'] = data['creation_date'].isoformat()
-        return data
+        """
+        Convert to dictionary for JSON serialization.
+        
+        Built fresh on every call: variants are mutated while they are
+        analyzed, so a cached dict could go stale. The output paths call
+        this at most once per variant, so console plus file output
+        serializes nothing twice.
+        """
+        # Spelled out rather than asdict(), which deep-copies every value
+        return {
+            'original_domain': self.original_domain,
+            'variant_domain': self.variant_domain,
+            'technique': self.technique,
+            'technique_detail': self.technique_detail,
+            'is_registered': self.is_registered,
+            'dns_records': {rtype: list(records) for rtype, records in self.dns_records.items()},
+            'whois_data': dict(self.whois_data),
+            'creation_date': self.creation_date.isoformat() if self.creation_date else None,
+            'registrar': self.registrar,
+            'domain_age_days': self.domain_age_days,
+            'trust_level': self.trust_level,
+            'risk_score': self.risk_score,
+            'error': self.error,
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class AnalysisConfig:
     """Configuration for the homograph analysis."""
     target_domain: str
@@ -281,22 +437,102 @@ class AnalysisConfig:
     threads: int = 10
     timeout: int = 5
     include_unregistered: bool = False
-    techniques: List[str] = field(default_factory=lambda: ['all'])
+    techniques: Iterable[str] = field(default_factory=lambda: ['all'])  # names or 'all'
     output_format: str = 'console'  # console, json, csv
     output_file: Optional[str] = None
     verbose: bool = False
 
 
+@dataclass
+class ResultSummary:
+    """Risk-ordered views and counts of analysis results, shared by all output formats."""
+    total: int
+    ranked: List[DomainVariant]  # every result, highest risk score first
+    registered: List[DomainVariant]  # registered results, same order
+    suspicious_count: int
+    high_risk_count: int  # registered results in HIGH_RISK_TRUST_LEVELS
+    # Taken when the summary is built, i.e. once per analysis run
+    analysis_date: str = field(default_factory=lambda: datetime.now().isoformat())
+    
+    @classmethod
+    def from_results(cls, results: List[DomainVariant]) -> 'ResultSummary':
+        """Sort results by risk once and collect the counts in a single pass."""
+        ranked = sorted(results, key=attrgetter('risk_score'), reverse=True)
+        registered = []
+        suspicious_count = 0
+        high_risk_count = 0
+        for result in ranked:
+            if result.is_registered:
+                registered.append(result)
+                if result.trust_level in HIGH_RISK_TRUST_LEVELS:
+                    high_risk_count += 1
+            if result.trust_level in SUSPICIOUS_TRUST_LEVELS:
+                suspicious_count += 1
+        return cls(len(ranked), ranked, registered, suspicious_count, high_risk_count)
+
+
 # ============================================================================
 # DOMAIN VARIANT GENERATOR
 # ============================================================================
 
+def normalize_techniques(techniques: Iterable[str]) -> FrozenSet[str]:
+    """Resolve a technique list (names or 'all') to a frozenset of known techniques."""
+    requested = {t.strip() for t in techniques}
+    if 'all' in requested:
+        return TECHNIQUE_SET
+    
+    unknown = requested - TECHNIQUE_SET
+    if unknown:
+        logger.warning(f"Ignoring unknown techniques: {', '.join(sorted(unknown))}")
+    return TECHNIQUE_SET & requested
+
+
+@lru_cache(maxsize=256)
+def _confusable_lookalikes(char: str) -> Tuple[str, ...]:
+    """
+    Get a character's lookalikes from confusable_homoglyphs: the first two
+    homoglyphs of its first two confusable groups. Cached per character, as
+    names repeat characters and the library scans its tables on every call.
+    """
+    from confusable_homoglyphs import confusables
+    lookalikes = []
+    conf = confusables.is_confusable(char, greedy=True)
+    if conf:
+        for item in conf[:2]:
+            for homoglyph in item.get('homoglyphs', [])[:2]:
+                repl = homoglyph.get('c', '')
+                if repl and repl != char:
+                    lookalikes.append(repl)
+    return tuple(lookalikes)
+
+
+def homograph_skeleton(domain: str) -> str:
+    """
+    Reduce a domain to its ASCII skeleton by undoing known lookalikes.
+    
+    Punycode labels are decoded first, so 'xn--80ak6aa92e.com' and
+    'аррӏе.com' both reduce to 'apple.com'. Two domains with the same
+    skeleton look alike; the mapping runs in a single str.translate pass.
+    """
+    labels = []
+    for label in domain.strip().rstrip('.').lower().split('.'):
+        if label.startswith('xn--'):
+            try:
+                label = label.encode('ascii').decode('idna')
+            except UnicodeError:
+                pass
+        labels.append(label)
+    return '.'.join(labels).lower().translate(_SKELETON_TABLE)
+
+
 class HomographGenerator:
     """Generates homograph domain variants using multiple techniques."""
     
     def __init__(self, config: AnalysisConfig):
         self.config = config
         self.domain_name, self.tld = self._parse_domain(config.target_domain)
+        # Shared by every variant this generator produces
+        self.original_domain = sys.intern(f"{self.domain_name}.{self.tld}")
         self.generated_variants: Set[str] = set()
         
     def _parse_domain(self, domain: str) -> Tuple[str, str]:
@@ -316,6 +552,7 @@ class HomographGenerator:
             domain = domain[4:]
         
         if TLDEXTRACT_AVAILABLE:
+            import tldextract
             extracted = tldextract.extract(domain)
             return extracted.domain, extracted.suffix
         else:
@@ -325,60 +562,101 @@ class HomographGenerator:
                 return parts[0], parts[1]
             return domain, 'com'
     
+    def _substitutions(
+        self,
+        table: Dict[str, Tuple[str, ...]],
+        by_code: Optional[Tuple[Tuple[Tuple[str, int], ...], ...]] = None
+    ) -> Iterator[Tuple[str, str, str]]:
+        """
+        Yield (char, replacement, new_name) for every single-character
+        substitution from table.
+        
+        by_code is the same table built by _by_code, for tables whose
+        replacements are all single ASCII characters. For ASCII names it is
+        indexed by each byte of the name, and each candidate is written into
+        one reused bytearray and decoded instead of being sliced together
+        from three strings.
+        """
+        name = self.domain_name
+        if by_code is None or not name.isascii():
+            for i, char in enumerate(name):
+                for replacement in table.get(char, ()):
+                    yield char, replacement, name[:i] + replacement + name[i+1:]
+            return
+        
+        buf = bytearray(name, 'ascii')
+        for i, code in enumerate(name.encode('ascii')):
+            replacements = by_code[code]
+            if replacements:
+                char = name[i]
+                for replacement, new_code in replacements:
+                    buf[i] = new_code
+                    yield char, replacement, buf.decode('ascii')
+                buf[i] = code
+    
     def _add_variant(self, name: str, tld: str, technique: str, detail: str = "") -> Optional[DomainVariant]:
         """Add a variant if it's unique and valid."""
+        # Skip if exceeds max variants (before doing any string work)
+        if len(self.generated_variants) >= self.config.max_variants:
+            return None
+        
         # Clean and validate
         name = name.lower().strip()
         tld = tld.lower().strip()
         
         if not name or not tld:
             return None
+        
+        # Skip names no registry accepts (labels of 1-63 characters without
+        # a leading or trailing hyphen) before building or hashing them
+        if (name[0] in '-.' or name[-1] in '-.' or '..' in name
+                or '-.' in name or '.-' in name
+                or (len(name) > 63 and max(map(len, name.split('.'))) > 63)):
+            return None
             
         full_domain = f"{name}.{tld}"
         
         # Skip if same as original
-        if full_domain == f"{self.domain_name}.{self.tld}":
+        if full_domain == self.original_domain:
             return None
             
-        # Skip if already generated
+        # Skip if already generated (the str caches its hash, so the test
+        # and the add below cost one hash computation)
         if full_domain in self.generated_variants:
             return None
             
-        # Skip if exceeds max variants
-        if len(self.generated_variants) >= self.config.max_variants:
-            return None
-            
         self.generated_variants.add(full_domain)
         
         return DomainVariant(
-            original_domain=f"{self.domain_name}.{self.tld}",
+            original_domain=self.original_domain,
             variant_domain=full_domain,
             technique=technique,
             technique_detail=detail
         )
     
+    def iter_all(self) -> Iterator[DomainVariant]:
+        """Yield domain variants technique by technique without accumulating them."""
+        selected = normalize_techniques(self.config.techniques)
+        
+        for technique in TECHNIQUES:
+            if technique not in selected:
+                continue
+            # Every later candidate would be rejected by _add_variant
+            if len(self.generated_variants) >= self.config.max_variants:
+                break
+            method = getattr(self, f'_generate_{technique}')
+            try:
+                results = method()
+            except Exception as e:
+                logger.warning(f"Error in technique {technique}: {e}")
+                continue
+            for variant in results:
+                if variant is not None:
+                    yield variant
+    
     def generate_all(self) -> List[DomainVariant]:
         """Generate all domain variants based on configured techniques."""
-        variants = []
-        techniques = self.config.techniques
-        
-        if 'all' in techniques:
-            techniques = [
-                'homograph', 'leetspeak', 'typo', 'phonetic',
-                'repetition', 'omission', 'insertion', 'transposition',
-                'hyphenation', 'tld', 'prefix', 'suffix', 'vowel_swap',
-                'double_char', 'bitsquatting', 'subdomain'
-            ]
-        
-        for technique in techniques:
-            method = getattr(self, f'_generate_{technique}', None)
-            if method:
-                try:
-                    results = method()
-                    variants.extend([v for v in results if v is not None])
-                except Exception as e:
-                    logger.warning(f"Error in technique {technique}: {e}")
-                    
+        variants = list(self.iter_all())
         logger.info(f"Generated {len(variants)} unique domain variants")
         return variants
     
@@ -388,34 +666,26 @@ class HomographGenerator:
         name = self.domain_name
         
         # Single character substitutions
-        for i, char in enumerate(name):
-            if char in HOMOGRAPH_MAPPINGS:
-                for replacement in HOMOGRAPH_MAPPINGS[char][:3]:  # Limit per char
-                    new_name = name[:i] + replacement + name[i+1:]
-                    variant = self._add_variant(
-                        new_name, self.tld, 'homograph',
-                        f"Replaced '{char}' with '{replacement}'"
-                    )
-                    if variant:
-                        variants.append(variant)
+        for char, replacement, new_name in self._substitutions(_HOMOGRAPH_SUBS):
+            variant = self._add_variant(
+                new_name, self.tld, 'homograph',
+                f"Replaced '{char}' with '{replacement}'"
+            )
+            if variant:
+                variants.append(variant)
         
         # Try confusable_homoglyphs library if available
         if CONFUSABLES_AVAILABLE:
             try:
                 for i, char in enumerate(name):
-                    conf = confusables.is_confusable(char, greedy=True)
-                    if conf:
-                        for item in conf[:2]:
-                            for homoglyph in item.get('homoglyphs', [])[:2]:
-                                repl = homoglyph.get('c', '')
-                                if repl and repl != char:
-                                    new_name = name[:i] + repl + name[i+1:]
-                                    variant = self._add_variant(
-                                        new_name, self.tld, 'homograph',
-                                        f"Confusable: '{char}' -> '{repl}'"
-                                    )
-                                    if variant:
-                                        variants.append(variant)
+                    for repl in _confusable_lookalikes(char):
+                        new_name = name[:i] + repl + name[i+1:]
+                        variant = self._add_variant(
+                            new_name, self.tld, 'homograph',
+                            f"Confusable: '{char}' -> '{repl}'"
+                        )
+                        if variant:
+                            variants.append(variant)
             except Exception as e:
                 logger.debug(f"Confusables error: {e}")
         
@@ -424,36 +694,28 @@ class HomographGenerator:
     def _generate_leetspeak(self) -> List[DomainVariant]:
         """Generate leetspeak variants."""
         variants = []
-        name = self.domain_name
         
-        for i, char in enumerate(name):
-            if char in LEETSPEAK_MAPPINGS:
-                for replacement in LEETSPEAK_MAPPINGS[char]:
-                    new_name = name[:i] + replacement + name[i+1:]
-                    variant = self._add_variant(
-                        new_name, self.tld, 'leetspeak',
-                        f"Replaced '{char}' with '{replacement}'"
-                    )
-                    if variant:
-                        variants.append(variant)
+        for char, replacement, new_name in self._substitutions(_LEETSPEAK_SUBS, _LEETSPEAK_BY_CODE):
+            variant = self._add_variant(
+                new_name, self.tld, 'leetspeak',
+                f"Replaced '{char}' with '{replacement}'"
+            )
+            if variant:
+                variants.append(variant)
         
         return variants
     
     def _generate_typo(self) -> List[DomainVariant]:
         """Generate keyboard typo variants."""
         variants = []
-        name = self.domain_name
         
-        for i, char in enumerate(name):
-            if char in KEYBOARD_TYPOS:
-                for replacement in KEYBOARD_TYPOS[char][:2]:  # Limit
-                    new_name = name[:i] + replacement + name[i+1:]
-                    variant = self._add_variant(
-                        new_name, self.tld, 'typo',
-                        f"Keyboard typo: '{char}' -> '{replacement}'"
-                    )
-                    if variant:
-                        variants.append(variant)
+        for char, replacement, new_name in self._substitutions(_TYPO_SUBS, _TYPO_BY_CODE):
+            variant = self._add_variant(
+                new_name, self.tld, 'typo',
+                f"Keyboard typo: '{char}' -> '{replacement}'"
+            )
+            if variant:
+                variants.append(variant)
         
         return variants
     
@@ -589,8 +851,7 @@ class HomographGenerator:
         """Generate prefix variants."""
         variants = []
         
-        for prefix in PHISHING_PREFIXES:
-            clean_prefix = prefix.rstrip('-.')
+        for prefix, clean_prefix in _CLEAN_PREFIXES:
             new_name = clean_prefix + self.domain_name
             variant = self._add_variant(
                 new_name, self.tld, 'prefix',
@@ -605,8 +866,7 @@ class HomographGenerator:
         """Generate suffix variants."""
         variants = []
         
-        for suffix in PHISHING_SUFFIXES:
-            clean_suffix = suffix.lstrip('-')
+        for suffix, clean_suffix in _CLEAN_SUFFIXES:
             new_name = self.domain_name + clean_suffix
             variant = self._add_variant(
                 new_name, self.tld, 'suffix',
@@ -620,20 +880,14 @@ class HomographGenerator:
     def _generate_vowel_swap(self) -> List[DomainVariant]:
         """Generate vowel swap variants."""
         variants = []
-        name = self.domain_name
-        vowels = 'aeiou'
         
-        for i, char in enumerate(name):
-            if char in vowels:
-                for vowel in vowels:
-                    if vowel != char:
-                        new_name = name[:i] + vowel + name[i+1:]
-                        variant = self._add_variant(
-                            new_name, self.tld, 'vowel_swap',
-                            f"Swapped '{char}' with '{vowel}'"
-                        )
-                        if variant:
-                            variants.append(variant)
+        for char, vowel, new_name in self._substitutions(_VOWEL_SWAPS, _VOWEL_SWAPS_BY_CODE):
+            variant = self._add_variant(
+                new_name, self.tld, 'vowel_swap',
+                f"Swapped '{char}' with '{vowel}'"
+            )
+            if variant:
+                variants.append(variant)
         
         return variants
     
@@ -660,22 +914,14 @@ class HomographGenerator:
     def _generate_bitsquatting(self) -> List[DomainVariant]:
         """Generate bitsquatting variants (single bit flips)."""
         variants = []
-        name = self.domain_name
         
-        for i, char in enumerate(name):
-            ascii_val = ord(char)
-            for bit in range(8):
-                flipped = ascii_val ^ (1 << bit)
-                if 97 <= flipped <= 122:  # lowercase letters
-                    new_char = chr(flipped)
-                    if new_char != char:
-                        new_name = name[:i] + new_char + name[i+1:]
-                        variant = self._add_variant(
-                            new_name, self.tld, 'bitsquatting',
-                            f"Bit flip: '{char}' -> '{new_char}'"
-                        )
-                        if variant:
-                            variants.append(variant)
+        for char, new_char, new_name in self._substitutions(_BIT_FLIPS, _BIT_FLIPS_BY_CODE):
+            variant = self._add_variant(
+                new_name, self.tld, 'bitsquatting',
+                f"Bit flip: '{char}' -> '{new_char}'"
+            )
+            if variant:
+                variants.append(variant)
         
         return variants
     
@@ -708,11 +954,16 @@ class DomainAnalyzer:
     def __init__(self, config: AnalysisConfig):
         self.config = config
         self.dns_resolver = None
+        self._whois_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._whois_slots_lock = threading.Lock()
         
         if DNS_AVAILABLE:
+            import dns.resolver
             self.dns_resolver = dns.resolver.Resolver()
             self.dns_resolver.timeout = config.timeout
             self.dns_resolver.lifetime = config.timeout
+            self.dns_resolver.use_edns(0, 0, DNS_EDNS_PAYLOAD)
+            self.dns_resolver.cache = dns.resolver.LRUCache(DNS_RESOLVER_CACHE_SIZE)
     
     def check_dns(self, domain: str) -> Tuple[bool, Dict[str, List[str]]]:
         """Check if domain resolves via DNS."""
@@ -720,6 +971,8 @@ class DomainAnalyzer:
         is_registered = False
         
         if DNS_AVAILABLE and self.dns_resolver:
+            import dns.exception
+            import dns.resolver
             for record_type in ['A', 'AAAA', 'MX', 'NS']:
                 try:
                     answers = self.dns_resolver.resolve(domain, record_type)
@@ -731,11 +984,11 @@ class DomainAnalyzer:
                 except Exception as e:
                     logger.debug(f"DNS error for {domain} ({record_type}): {e}")
         else:
-            # Fallback to basic socket lookup
+            # Fallback to the system resolver. Its timeout comes from the OS
+            # configuration (socket.setdefaulttimeout does not apply to name
+            # lookups and would change every other socket in the process)
             try:
-                socket.setdefaulttimeout(self.config.timeout)
-                result = socket.gethostbyname(domain)
-                records['A'] = [result]
+                records['A'] = socket.gethostbyname_ex(domain)[2]
                 is_registered = True
             except socket.gaierror:
                 pass
@@ -744,39 +997,50 @@ class DomainAnalyzer:
         
         return is_registered, records
     
+    def _whois_slot(self, domain: str) -> threading.BoundedSemaphore:
+        """Get the semaphore limiting concurrent WHOIS lookups for a domain's TLD."""
+        tld = domain.rsplit('.', 1)[-1].lower()
+        with self._whois_slots_lock:
+            slot = self._whois_slots.get(tld)
+            if slot is None:
+                slot = self._whois_slots[tld] = threading.BoundedSemaphore(
+                    WHOIS_TLD_CONCURRENCY
+                )
+        return slot
+    
     def get_whois(self, domain: str) -> Tuple[Optional[datetime], Optional[str], Dict]:
         """Get WHOIS data for a domain."""
-        creation_date = None
-        registrar = None
-        whois_data = {}
-        
         if not WHOIS_AVAILABLE:
             return None, None, {}
         
         try:
-            w = whois.whois(domain)
-            whois_data = dict(w) if w else {}
-            
-            # Handle creation_date (can be list or single value)
-            cd = w.creation_date
-            if isinstance(cd, list):
-                creation_date = cd[0] if cd else None
-            else:
-                creation_date = cd
-            
-            # Ensure it's a datetime object
-            if creation_date and not isinstance(creation_date, datetime):
-                try:
-                    creation_date = datetime.strptime(str(creation_date), '%Y-%m-%d')
-                except:
-                    creation_date = None
-            
-            registrar = w.registrar
-            
+            return self._query_whois(domain)
         except Exception as e:
             logger.debug(f"WHOIS error for {domain}: {e}")
+            return None, None, {}
+    
+    def _query_whois(self, domain: str) -> Tuple[Optional[datetime], Optional[str], Dict]:
+        """Look a domain up with python-whois, letting lookup errors propagate."""
+        import whois
+        with self._whois_slot(domain):
+            w = whois.whois(domain)
+        whois_data = dict(w) if w else {}
+        
+        # Handle creation_date (can be list or single value)
+        cd = w.creation_date
+        if isinstance(cd, list):
+            creation_date = cd[0] if cd else None
+        else:
+            creation_date = cd
         
-        return creation_date, registrar, whois_data
+        # Ensure it's a datetime object
+        if creation_date and not isinstance(creation_date, datetime):
+            try:
+                creation_date = datetime.strptime(str(creation_date), '%Y-%m-%d')
+            except:
+                creation_date = None
+        
+        return creation_date, w.registrar, whois_data
     
     def calculate_trust_level(self, domain_age_days: Optional[int]) -> Tuple[str, int]:
         """Calculate trust level and risk score based on domain age."""
@@ -798,8 +1062,54 @@ class DomainAnalyzer:
         else:
             return 'established', 15
     
-    def analyze_variant(self, variant: DomainVariant) -> DomainVariant:
-        """Analyze a single domain variant."""
+    def apply_whois(
+        self,
+        variant: DomainVariant,
+        creation_date: Optional[datetime],
+        registrar: Optional[str],
+        whois_data: Dict,
+        now: Optional[datetime] = None
+    ) -> None:
+        """
+        Record WHOIS results on a variant and classify its trust level.
+        
+        ``now`` is the time domain age is measured against; batch callers
+        pass one value for every variant (defaults to the current time).
+        """
+        # Registrar and country strings repeat across thousands of variants;
+        # intern them so every variant shares one copy
+        variant.creation_date = creation_date
+        variant.registrar = sys.intern(registrar) if isinstance(registrar, str) else registrar
+        variant.whois_data = {
+            k: str(v) for k, v in whois_data.items()
+            if k in _WHOIS_KEPT_FIELDS
+        }
+        for key in ('registrar', 'country'):
+            if key in variant.whois_data:
+                variant.whois_data[key] = sys.intern(variant.whois_data[key])
+        
+        # Calculate domain age
+        if creation_date:
+            age_delta = (now or datetime.now()) - creation_date
+            variant.domain_age_days = age_delta.days
+        
+        # Calculate trust level
+        variant.trust_level, variant.risk_score = self.calculate_trust_level(
+            variant.domain_age_days
+        )
+        variant.trust_code = TRUST_CODES.get(variant.trust_level, TRUST_CODES['unknown'])
+    
+    def needs_whois(self, variant: DomainVariant) -> bool:
+        """
+        Whether a WHOIS lookup is worthwhile for a variant.
+        
+        Only registered variants are queried; NXDOMAIN already says the
+        name is not in use.
+        """
+        return variant.is_registered
+    
+    def analyze_variant(self, variant: DomainVariant, now: Optional[datetime] = None) -> DomainVariant:
+        """Analyze a single domain variant (``now``: see apply_whois)."""
         try:
             # Check DNS
             if self.config.check_dns:
@@ -808,27 +1118,11 @@ class DomainAnalyzer:
                 )
             
             # Only do WHOIS if domain is registered
-            if variant.is_registered and self.config.check_whois:
+            if self.config.check_whois and self.needs_whois(variant):
                 creation_date, registrar, whois_data = self.get_whois(
                     variant.variant_domain
                 )
-                variant.creation_date = creation_date
-                variant.registrar = registrar
-                variant.whois_data = {
-                    k: str(v) for k, v in whois_data.items()
-                    if k in ['domain_name', 'registrar', 'creation_date', 
-                            'expiration_date', 'name_servers', 'org', 'country']
-                }
-                
-                # Calculate domain age
-                if creation_date:
-                    age_delta = datetime.now() - creation_date
-                    variant.domain_age_days = age_delta.days
-                
-                # Calculate trust level
-                variant.trust_level, variant.risk_score = self.calculate_trust_level(
-                    variant.domain_age_days
-                )
+                self.apply_whois(variant, creation_date, registrar, whois_data, now)
             elif variant.is_registered:
                 variant.trust_level = 'unknown'
                 variant.risk_score = 50
@@ -840,52 +1134,68 @@ class DomainAnalyzer:
             variant.error = str(e)
             logger.debug(f"Error analyzing {variant.variant_domain}: {e}")
         
+        variant.trust_code = TRUST_CODES.get(variant.trust_level, TRUST_CODES['unknown'])
         return variant
     
-    def analyze_all(self, variants: List[DomainVariant]) -> List[DomainVariant]:
-        """Analyze all variants with concurrent processing."""
+    def iter_analyzed(self, variants: Iterable[DomainVariant]) -> Iterator[DomainVariant]:
+        """
+        Analyze variants concurrently, yielding each one as it completes.
+        
+        At most ANALYSIS_WINDOW_PER_THREAD variants per thread are in flight,
+        so the input (e.g. HomographGenerator.iter_all) is consumed lazily and
+        only finished variants the caller keeps stay in memory.
+        """
+        window = self.config.threads * ANALYSIS_WINDOW_PER_THREAD
+        now = datetime.now()  # one reference time for every domain age
+        with ThreadPoolExecutor(max_workers=self.config.threads) as executor:
+            pending = set()
+            for variant in variants:
+                pending.add(executor.submit(self.analyze_variant, variant, now))
+                if len(pending) >= window:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            for future in as_completed(pending):
+                yield future.result()
+    
+    def analyze_all(
+        self,
+        variants: List[DomainVariant],
+        use_rich: Optional[bool] = None
+    ) -> List[DomainVariant]:
+        """
+        Analyze all variants with concurrent processing.
+        
+        Progress is shown with a rich progress bar when use_rich is true
+        (defaults to RICH_AVAILABLE), and as plain text lines otherwise.
+        """
+        if use_rich is None:
+            use_rich = RICH_AVAILABLE
         results = []
         total = len(variants)
         
-        if RICH_AVAILABLE:
+        if use_rich:
+            from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
             with Progress(
                 SpinnerColumn(),
                 TextColumn("[progress.description]{task.description}"),
                 BarColumn(),
                 TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
-                console=console
+                console=_get_console()
             ) as progress:
                 task = progress.add_task(
                     f"[cyan]Analyzing {total} domains...", total=total
                 )
                 
-                with ThreadPoolExecutor(max_workers=self.config.threads) as executor:
-                    futures = {
-                        executor.submit(self.analyze_variant, v): v
-                        for v in variants
-                    }
-                    
-                    for future in as_completed(futures):
-                        result = future.result()
-                        results.append(result)
-                        progress.advance(task)
-                        time.sleep(0.1)  # Rate limiting
+                for result in self.iter_analyzed(variants):
+                    results.append(result)
+                    progress.advance(task)
         else:
             print(f"Analyzing {total} domains...")
-            with ThreadPoolExecutor(max_workers=self.config.threads) as executor:
-                futures = {
-                    executor.submit(self.analyze_variant, v): v
-                    for v in variants
-                }
-                
-                completed = 0
-                for future in as_completed(futures):
-                    result = future.result()
-                    results.append(result)
-                    completed += 1
-                    if completed % 10 == 0:
-                        print(f"  Progress: {completed}/{total}")
-                    time.sleep(0.1)
+            for result in self.iter_analyzed(variants):
+                results.append(result)
+                if len(results) % 10 == 0:
+                    print(f"  Progress: {len(results)}/{total}")
         
         return results
 
@@ -894,27 +1204,117 @@ class DomainAnalyzer:
 # OUTPUT FORMATTERS
 # ============================================================================
 
+def _json_default(obj: Any) -> Any:
+    """Serialize DomainVariant via to_dict and anything else unknown via str."""
+    if isinstance(obj, DomainVariant):
+        return obj.to_dict()
+    return str(obj)
+
+
+# DomainVariant and datetime go through _json_default, like on the stdlib path
+_ORJSON_OPTIONS = (
+    orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+    | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_DATETIME
+    if ORJSON_AVAILABLE else 0
+)
+
+
+def dump_json(obj: Any, fp) -> None:
+    """
+    Write obj as indented UTF-8 JSON to a binary file, using orjson when available.
+    
+    DomainVariant objects may appear anywhere in obj and come out as their
+    to_dict() form on both paths; orjson's native dataclass support is
+    bypassed because it would also emit internal fields such as trust_code.
+    Non-ASCII text (IDN variants) is written as raw UTF-8 rather than
+    \\u escapes, which is all orjson can produce, so both paths give
+    byte-identical output.
+    """
+    if ORJSON_AVAILABLE:
+        fp.write(orjson.dumps(obj, option=_ORJSON_OPTIONS, default=_json_default))
+    else:
+        fp.write(json.dumps(
+            obj, indent=2, ensure_ascii=False, default=_json_default
+        ).encode('utf-8'))
+
+
+def _dumps_json(obj: Any) -> str:
+    """Text counterpart of dump_json: obj as an indented JSON string."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=_ORJSON_OPTIONS, default=_json_default).decode('utf-8')
+    return json.dumps(obj, indent=2, ensure_ascii=False, default=_json_default)
+
+
+# Column layout of the basic console table, shared by its header and rows
+_BASIC_ROW = "{:<35} {:<15} {:<8} {:<12} {:<5}".format
+
+
+# CSV columns, in output order, and a getter that fetches them in one call
+_CSV_FIELDNAMES = (
+    'variant_domain', 'original_domain', 'technique', 'technique_detail',
+    'is_registered', 'creation_date', 'domain_age_days', 'trust_level',
+    'risk_score', 'registrar', 'dns_records', 'error'
+)
+_CSV_GET = attrgetter(*_CSV_FIELDNAMES)
+
+
+def _csv_row(result: DomainVariant) -> Tuple:
+    """Fetch a result's CSV fields, rendering dates, blanks and DNS records."""
+    (variant_domain, original_domain, technique, technique_detail, is_registered,
+     creation_date, domain_age_days, trust_level, risk_score, registrar,
+     dns_records, error) = _CSV_GET(result)
+    return (
+        variant_domain, original_domain, technique, technique_detail, is_registered,
+        creation_date.isoformat() if creation_date else '',
+        domain_age_days or '',
+        trust_level, risk_score,
+        registrar or '',
+        # Unregistered variants all carry an empty dict; skip the encoder
+        json.dumps(dns_records) if dns_records else '{}',
+        error or ''
+    )
+
+
 class OutputFormatter:
     """Formats and outputs analysis results."""
     
     @staticmethod
-    def format_console(results: List[DomainVariant], config: AnalysisConfig):
-        """Format results for console output."""
-        # Filter results
-        if not config.include_unregistered:
-            results = [r for r in results if r.is_registered]
+    def format_console(
+        results: List[DomainVariant],
+        config: AnalysisConfig,
+        summary: Optional[ResultSummary] = None,
+        use_rich: Optional[bool] = None
+    ):
+        """
+        Format results for console output (summary: precomputed from results).
+        
+        Renders with rich when use_rich is true (defaults to RICH_AVAILABLE),
+        as a plain-text table otherwise.
+        """
+        if summary is None:
+            summary = ResultSummary.from_results(results)
+        if use_rich is None:
+            use_rich = RICH_AVAILABLE
         
-        # Sort by risk score (highest first)
-        results.sort(key=lambda x: x.risk_score, reverse=True)
+        # Highest risk first, unregistered variants only if requested
+        shown = summary.ranked if config.include_unregistered else summary.registered
         
-        if RICH_AVAILABLE:
-            OutputFormatter._rich_console_output(results, config)
+        if use_rich:
+            OutputFormatter._rich_console_output(shown, config, summary)
         else:
-            OutputFormatter._basic_console_output(results, config)
+            OutputFormatter._basic_console_output(shown, config, summary)
     
     @staticmethod
-    def _rich_console_output(results: List[DomainVariant], config: AnalysisConfig):
+    def _rich_console_output(
+        results: List[DomainVariant],
+        config: AnalysisConfig,
+        summary: ResultSummary
+    ):
         """Rich console output with tables."""
+        from rich.panel import Panel
+        from rich.table import Table
+        from rich.text import Text
+        console = _get_console()
         console.print()
         console.print(Panel(
             f"[bold]Homograph Analysis Results for [cyan]{config.target_domain}[/cyan][/bold]\n"
@@ -923,14 +1323,10 @@ class OutputFormatter:
         ))
         
         # Summary statistics
-        registered = [r for r in results if r.is_registered]
-        suspicious = [r for r in registered if r.trust_level in 
-                     ['critical', 'high_risk', 'suspicious', 'low_trust']]
-        
         console.print(f"\n[bold]Summary:[/bold]")
-        console.print(f"  Total variants generated: {len(results) + len([r for r in results if not r.is_registered])}")
-        console.print(f"  Registered domains found: [yellow]{len(registered)}[/yellow]")
-        console.print(f"  Suspicious/Low-trust domains: [red]{len(suspicious)}[/red]")
+        console.print(f"  Total variants generated: {summary.total}")
+        console.print(f"  Registered domains found: [yellow]{len(summary.registered)}[/yellow]")
+        console.print(f"  Suspicious/Low-trust domains: [red]{summary.suspicious_count}[/red]")
         
         if not results:
             console.print("\n[yellow]No registered domains found.[/yellow]")
@@ -945,28 +1341,22 @@ class OutputFormatter:
         table.add_column("Risk Score", justify="right")
         table.add_column("Registrar", style="dim", max_width=30)
         
-        risk_colors = {
-            'critical': 'red bold',
-            'high_risk': 'red',
-            'suspicious': 'yellow',
-            'low_trust': 'yellow dim',
-            'moderate': 'green dim',
-            'established': 'green',
-            'unknown': 'dim',
-            'unregistered': 'dim'
-        }
-        
+        # Cells are passed as Text so rich skips markup parsing for each one;
+        # the per-row lookups are bound once outside the loop
+        risk_style_for = _RISK_STYLES.get
+        styled = Text.styled
+        add_row = table.add_row
         for result in results[:50]:  # Limit display
             age_str = str(result.domain_age_days) if result.domain_age_days else "N/A"
-            risk_style = risk_colors.get(result.trust_level, 'dim')
+            risk_style = risk_style_for(result.trust_level, 'dim')
             
-            table.add_row(
-                result.variant_domain,
-                result.technique,
-                age_str,
-                f"[{risk_style}]{result.trust_level}[/{risk_style}]",
-                f"[{risk_style}]{result.risk_score}[/{risk_style}]",
-                result.registrar or "N/A"
+            add_row(
+                Text(result.variant_domain),
+                Text(result.technique),
+                Text(age_str),
+                styled(result.trust_level, risk_style),
+                styled(str(result.risk_score), risk_style),
+                Text(result.registrar or "N/A")
             )
         
         console.print(table)
@@ -975,92 +1365,138 @@ class OutputFormatter:
             console.print(f"\n[dim]... and {len(results) - 50} more results.[/dim]")
     
     @staticmethod
-    def _basic_console_output(results: List[DomainVariant], config: AnalysisConfig):
-        """Basic console output without rich."""
-        print("\n" + "=" * 70)
-        print(f"Homograph Analysis Results for {config.target_domain}")
-        print(f"Trust threshold: {config.trust_threshold_days} days")
-        print("=" * 70)
-        
-        registered = [r for r in results if r.is_registered]
-        suspicious = [r for r in registered if r.trust_level in 
-                     ['critical', 'high_risk', 'suspicious', 'low_trust']]
-        
-        print(f"\nSummary:")
-        print(f"  Registered domains found: {len(registered)}")
-        print(f"  Suspicious/Low-trust: {len(suspicious)}")
+    def _basic_console_output(
+        results: List[DomainVariant],
+        config: AnalysisConfig,
+        summary: ResultSummary
+    ):
+        """Basic console output without rich, written to stdout in one call."""
+        lines = [
+            "\n" + "=" * 70,
+            f"Homograph Analysis Results for {config.target_domain}",
+            f"Trust threshold: {config.trust_threshold_days} days",
+            "=" * 70,
+            f"\nSummary:",
+            f"  Registered domains found: {len(summary.registered)}",
+            f"  Suspicious/Low-trust: {summary.suspicious_count}",
+        ]
         
         if not results:
-            print("\nNo registered domains found.")
-            return
-        
-        print("\nDetailed Results:")
-        print("-" * 70)
-        print(f"{'Domain':<35} {'Technique':<15} {'Age':<8} {'Trust':<12} {'Risk':<5}")
-        print("-" * 70)
+            lines.append("\nNo registered domains found.")
+        else:
+            lines.append("\nDetailed Results:")
+            lines.append("-" * 70)
+            lines.append(_BASIC_ROW('Domain', 'Technique', 'Age', 'Trust', 'Risk'))
+            lines.append("-" * 70)
+            
+            for result in results[:50]:
+                age_str = str(result.domain_age_days) if result.domain_age_days else "N/A"
+                lines.append(_BASIC_ROW(result.variant_domain, result.technique, age_str,
+                                        result.trust_level, result.risk_score))
         
-        for result in results[:50]:
-            age_str = str(result.domain_age_days) if result.domain_age_days else "N/A"
-            print(f"{result.variant_domain:<35} {result.technique:<15} {age_str:<8} "
-                  f"{result.trust_level:<12} {result.risk_score:<5}")
+        lines.append("")
+        sys.stdout.write("\n".join(lines))
     
     @staticmethod
-    def format_json(results: List[DomainVariant], config: AnalysisConfig) -> str:
-        """Format results as JSON."""
-        output = {
+    def _json_document(
+        results: List[DomainVariant],
+        config: AnalysisConfig,
+        summary: Optional[ResultSummary] = None
+    ) -> Dict[str, Any]:
+        """Build the JSON report for results (summary: precomputed from results)."""
+        if summary is None:
+            summary = ResultSummary.from_results(results)
+        return {
             'analysis_config': {
                 'target_domain': config.target_domain,
                 'trust_threshold_days': config.trust_threshold_days,
-                'analysis_date': datetime.now().isoformat(),
+                'analysis_date': summary.analysis_date,
             },
             'summary': {
-                'total_variants': len(results),
-                'registered_count': len([r for r in results if r.is_registered]),
-                'suspicious_count': len([r for r in results if r.trust_level in 
-                                        ['critical', 'high_risk', 'suspicious', 'low_trust']]),
+                'total_variants': summary.total,
+                'registered_count': len(summary.registered),
+                'suspicious_count': summary.suspicious_count,
             },
-            'results': [r.to_dict() for r in results]
+            # Serialized from the DomainVariant objects, see _json_default
+            'results': results
         }
-        return json.dumps(output, indent=2, default=str)
     
     @staticmethod
-    def format_csv(results: List[DomainVariant], config: AnalysisConfig) -> str:
-        """Format results as CSV."""
-        import io
-        output = io.StringIO()
-        fieldnames = [
-            'variant_domain', 'original_domain', 'technique', 'technique_detail',
-            'is_registered', 'creation_date', 'domain_age_days', 'trust_level',
-            'risk_score', 'registrar', 'dns_records', 'error'
-        ]
+    def format_json(
+        results: List[DomainVariant],
+        config: AnalysisConfig,
+        summary: Optional[ResultSummary] = None,
+        fp: Optional[TextIO] = None
+    ) -> Optional[str]:
+        """
+        Format results as JSON (summary: precomputed from results).
+
+        With fp the document is encoded incrementally into the handle and
+        None is returned; otherwise it is returned as a string.
+        """
+        output = OutputFormatter._json_document(results, config, summary)
+        if fp is None:
+            return _dumps_json(output)
+        if ORJSON_AVAILABLE:
+            fp.write(_dumps_json(output))
+        else:
+            json.dump(output, fp, indent=2, ensure_ascii=False, default=_json_default)
+        return None
+    
+    @staticmethod
+    def write_json(
+        results: List[DomainVariant],
+        config: AnalysisConfig,
+        fp,
+        summary: Optional[ResultSummary] = None
+    ) -> None:
+        """
+        Write results as UTF-8 JSON to a binary file (see dump_json).
+
+        orjson's bytes go to the file as they are, without a text-layer
+        encode.
+        """
+        dump_json(OutputFormatter._json_document(results, config, summary), fp)
+    
+    @staticmethod
+    def format_csv(
+        results: List[DomainVariant],
+        config: AnalysisConfig,
+        fp: Optional[TextIO] = None
+    ) -> Optional[str]:
+        """
+        Format results as CSV.
+
+        With fp rows are written straight to the handle (open it with
+        newline='') and None is returned; otherwise the CSV is returned
+        as a string.
+        """
+        if fp is None:
+            output = io.StringIO()
+        else:
+            output = fp
+        writer = csv.writer(output)
+        writer.writerow(_CSV_FIELDNAMES)
+        writer.writerows(map(_csv_row, results))
         
-        writer = csv.DictWriter(output, fieldnames=fieldnames)
-        writer.writeheader()
-        
-        for result in results:
-            row = {
-                'variant_domain': result.variant_domain,
-                'original_domain': result.original_domain,
-                'technique': result.technique,
-                'technique_detail': result.technique_detail,
-                'is_registered': result.is_registered,
-                'creation_date': result.creation_date.isoformat() if result.creation_date else '',
-                'domain_age_days': result.domain_age_days or '',
-                'trust_level': result.trust_level,
-                'risk_score': result.risk_score,
-                'registrar': result.registrar or '',
-                'dns_records': json.dumps(result.dns_records),
-                'error': result.error or ''
-            }
-            writer.writerow(row)
-        
-        return output.getvalue()
+        return output.getvalue() if fp is None else None
 
 
 # ============================================================================
 # MAIN APPLICATION
 # ============================================================================
 
+def _techniques_arg(value: str) -> FrozenSet[str]:
+    """argparse type for --techniques: reject unknown names, resolve the rest."""
+    requested = {t.strip() for t in value.split(',')} - {''}
+    unknown = requested - TECHNIQUE_SET - {'all'}
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"unknown technique(s): {', '.join(sorted(unknown))}"
+        )
+    return normalize_techniques(requested)
+
+
 def create_parser() -> argparse.ArgumentParser:
     """Create argument parser."""
     parser = argparse.ArgumentParser(
@@ -1108,7 +1544,7 @@ Examples:
     
     parser.add_argument(
         '--techniques',
-        type=str,
+        type=_techniques_arg,
         default='all',
         help='Comma-separated list of techniques (default: all). '
              'Options: homograph,leetspeak,typo,phonetic,repetition,'
@@ -1174,23 +1610,32 @@ def main():
         threads=args.threads,
         timeout=args.timeout,
         include_unregistered=args.include_unregistered,
-        techniques=args.techniques.split(','),
+        techniques=args.techniques,
         output_format=args.output,
         output_file=args.file,
         verbose=args.verbose
     )
     
+    # rich is only imported for console output on a terminal; JSON/CSV
+    # one-shots, piped output and NO_COLOR (https://no-color.org) skip it
+    use_rich = (
+        RICH_AVAILABLE
+        and config.output_format == 'console'
+        and sys.stdout.isatty()
+        and not os.environ.get('NO_COLOR')
+    )
+    
     # Print header
-    if RICH_AVAILABLE:
+    if use_rich:
+        from rich.panel import Panel
+        console = _get_console()
         console.print(Panel(
             "[bold blue]Homograph Domain Analyzer[/bold blue]\n"
             "Detecting potential phishing and typosquatting domains",
             title="🔍 Security Analysis Tool"
         ))
     else:
-        print("\n" + "=" * 50)
-        print("Homograph Domain Analyzer")
-        print("=" * 50)
+        print("\n" + "=" * 50 + "\nHomograph Domain Analyzer\n" + "=" * 50)
     
     # Generate variants
     logger.info(f"Generating variants for: {config.target_domain}")
@@ -1204,48 +1649,48 @@ def main():
     # Analyze variants
     logger.info(f"Analyzing {len(variants)} variants...")
     analyzer = DomainAnalyzer(config)
-    results = analyzer.analyze_all(variants)
+    results = analyzer.analyze_all(variants, use_rich=use_rich)
     
-    # Sort by risk score
-    results.sort(key=lambda x: x.risk_score, reverse=True)
+    # Sort by risk score and count once for every output format
+    summary = ResultSummary.from_results(results)
+    results = summary.ranked
     
     # Output results
     if config.output_format == 'json':
-        output = OutputFormatter.format_json(results, config)
         if config.output_file:
-            with open(config.output_file, 'w') as f:
-                f.write(output)
+            with open(config.output_file, 'wb', buffering=1 << 20) as f:
+                OutputFormatter.write_json(results, config, f, summary)
             print(f"Results saved to: {config.output_file}")
         else:
-            print(output)
+            OutputFormatter.format_json(results, config, summary, sys.stdout)
+            print()
     
     elif config.output_format == 'csv':
-        output = OutputFormatter.format_csv(results, config)
         if config.output_file:
-            with open(config.output_file, 'w') as f:
-                f.write(output)
+            with open(config.output_file, 'w', newline='', encoding='utf-8',
+                      buffering=1 << 20) as f:
+                OutputFormatter.format_csv(results, config, f)
             print(f"Results saved to: {config.output_file}")
         else:
-            print(output)
+            OutputFormatter.format_csv(results, config, sys.stdout)
+            print()
     
     else:
-        OutputFormatter.format_console(results, config)
+        OutputFormatter.format_console(results, config, summary, use_rich=use_rich)
         if config.output_file:
             # Also save to file
-            output = OutputFormatter.format_json(results, config)
-            with open(config.output_file, 'w') as f:
-                f.write(output)
+            with open(config.output_file, 'wb', buffering=1 << 20) as f:
+                OutputFormatter.write_json(results, config, f, summary)
             print(f"\nResults also saved to: {config.output_file}")
     
     # Return exit code based on suspicious domains found
-    suspicious = [r for r in results if r.is_registered and 
-                  r.trust_level in ['critical', 'high_risk', 'suspicious']]
+    suspicious = summary.high_risk_count
     
     if suspicious:
-        if RICH_AVAILABLE:
-            console.print(f"\n[bold red]⚠ Warning: {len(suspicious)} suspicious domains found![/bold red]")
+        if use_rich:
+            console.print(f"\n[bold red]⚠ Warning: {suspicious} suspicious domains found![/bold red]")
         else:
-            print(f"\nWarning: {len(suspicious)} suspicious domains found!")
+            print(f"\nWarning: {suspicious} suspicious domains found!")
         return 2
     
     return 0
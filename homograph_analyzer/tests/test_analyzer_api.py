@@ -0,0 +1,387 @@
+"""
+Unit tests for the asynchronous lookup helpers in analyzer_api.
+
+Covers the port-43 WHOIS client and parser, the DNS answer cache, the
+adaptive DNS timeout and the on-disk WHOIS cache. Nothing here touches
+the network: sockets, clocks and python-whois are stubbed out.
+"""
+
+import asyncio
+import json
+import os
+from datetime import datetime
+
+import pytest
+
+import analyzer_api
+from analyzer_api import (
+    CachedDomainAnalyzer,
+    HomographDomainAnalyzer,
+    _DNSCache,
+    _LatencyStats,
+    _parse_whois_response,
+    _whois_server_for,
+)
+from homograph_domain_analyzer import AnalysisConfig
+
+
+VERISIGN_RESPONSE = """\
+   Domain Name: EXAMPLE.COM
+   Registry Domain ID: 2336799_DOMAIN_COM-VRSN
+   Registrar WHOIS Server: whois.iana.org
+   Updated Date: 2024-08-14T07:01:34Z
+   Creation Date: 1995-08-14T04:00:00Z
+   Registry Expiry Date: 2025-08-13T04:00:00Z
+   Registrar: RESERVED-Internet Assigned Numbers Authority
+   Registrar IANA ID: 376
+   Name Server: A.IANA-SERVERS.NET
+   Name Server: B.IANA-SERVERS.NET
+   DNSSEC: signedDelegation
+>>> Last update of whois database: 2024-09-01T12:00:00Z <<<
+"""
+
+PIR_RESPONSE = """\
+Domain Name: example.org
+Creation Date: 1995-08-31T04:00:00.123Z
+Registrar: ExampleRegistrar, Inc.
+"""
+
+VERISIGN_NOT_FOUND = """\
+No match for "EXAMPL3.COM".
+>>> Last update of whois database: 2024-09-01T12:00:00Z <<<
+"""
+
+
+class FakeClock:
+    """Stand-in for time.monotonic / time.time that only moves when told to."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+# ============================================================================
+# PORT-43 WHOIS PARSER
+# ============================================================================
+
+def test_parse_verisign_response():
+    creation_date, registrar, fields = _parse_whois_response(VERISIGN_RESPONSE)
+
+    assert creation_date == datetime(1995, 8, 14, 4, 0)
+    assert registrar == 'RESERVED-Internet Assigned Numbers Authority'
+    assert fields['expiration_date'] == '2025-08-13T04:00:00Z'
+    assert fields['name_servers'] == ['a.iana-servers.net', 'b.iana-servers.net']
+
+
+def test_parse_strips_fractional_seconds():
+    creation_date, registrar, _ = _parse_whois_response(PIR_RESPONSE)
+
+    assert creation_date == datetime(1995, 8, 31, 4, 0)
+    assert registrar == 'ExampleRegistrar, Inc.'
+
+
+def test_parse_converts_offsets_to_utc():
+    creation_date, _, _ = _parse_whois_response("Creation Date: 2020-01-02T03:00:00+02:00\n")
+
+    assert creation_date == datetime(2020, 1, 2, 1, 0)
+
+
+def test_parse_falls_back_to_date_prefix():
+    creation_date, _, _ = _parse_whois_response("Registered On: 2019-06-30 (dd/mm/yyyy n/a)\n")
+
+    assert creation_date == datetime(2019, 6, 30)
+
+
+@pytest.mark.parametrize('text', [
+    VERISIGN_NOT_FOUND,
+    "NOT FOUND\n",
+    "Domain not found.\n",
+    "The queried object does not exist: DOMAIN NOT FOUND\n",
+])
+def test_parse_not_found_answers(text):
+    assert _parse_whois_response(text) == (None, None, {})
+
+
+@pytest.mark.parametrize('text', [
+    "",
+    "Your connection limit exceeded. Please slow down and try again later.\n",
+    "Creation Date: not a date\n",
+])
+def test_parse_unrecognised_answers(text):
+    assert _parse_whois_response(text) is None
+
+
+def test_whois_server_for():
+    assert _whois_server_for('EXAMPLE.COM') == 'whois.verisign-grs.com'
+    assert _whois_server_for('example.org') == 'whois.pir.org'
+    assert _whois_server_for('example.co.uk') is None
+
+
+# ============================================================================
+# ASYNC WHOIS BATCH
+# ============================================================================
+
+@pytest.fixture
+def fake_port43(monkeypatch):
+    """
+    Replace server resolution and _whois_query with in-memory fakes.
+
+    Returns a dict collecting getaddrinfo calls, peak concurrent queries
+    per server address, and the per-domain answers to serve (a string, or
+    an exception instance to raise).
+    """
+    state = {'resolved': [], 'in_flight': {}, 'peak': {}, 'answers': {}}
+
+    async def getaddrinfo(self, host, port, *args, **kwargs):
+        state['resolved'].append(host)
+        return [(None, None, None, '', (f'addr:{host}', port))]
+
+    async def whois_query(address, domain):
+        state['in_flight'][address] = state['in_flight'].get(address, 0) + 1
+        state['peak'][address] = max(state['peak'].get(address, 0), state['in_flight'][address])
+        try:
+            await asyncio.sleep(0.01)
+            answer = state['answers'].get(domain, VERISIGN_NOT_FOUND)
+            if isinstance(answer, BaseException):
+                raise answer
+            return answer
+        finally:
+            state['in_flight'][address] -= 1
+
+    monkeypatch.setattr(asyncio.BaseEventLoop, 'getaddrinfo', getaddrinfo)
+    monkeypatch.setattr(analyzer_api, '_whois_query', whois_query)
+    return state
+
+
+def test_whois_batch_limits_each_server(monkeypatch, fake_port43):
+    monkeypatch.setattr(analyzer_api, 'WHOIS_SERVER_CONCURRENCY', 2)
+    domains = [f'v{i}.com' for i in range(6)] + [f'v{i}.org' for i in range(6)]
+
+    results = asyncio.run(HomographDomainAnalyzer()._whois_batch(domains))
+
+    assert results == {d: (None, None, {}) for d in domains}
+    assert fake_port43['peak'] == {
+        'addr:whois.verisign-grs.com': 2,
+        'addr:whois.pir.org': 2,
+    }
+    # Each server's hostname is looked up once per batch
+    assert sorted(fake_port43['resolved']) == ['whois.pir.org', 'whois.verisign-grs.com']
+
+
+def test_whois_batch_failures_fall_back(fake_port43):
+    fake_port43['answers'] = {
+        'found.com': VERISIGN_RESPONSE,
+        'refused.com': ConnectionRefusedError(),
+        'slow.com': asyncio.TimeoutError(),
+        'garbled.com': "rate limited\n",
+    }
+
+    results = asyncio.run(HomographDomainAnalyzer()._whois_batch(
+        ['found.com', 'refused.com', 'slow.com', 'garbled.com', 'missing.com']
+    ))
+
+    assert results['found.com'][0] == datetime(1995, 8, 14, 4, 0)
+    assert results['refused.com'] is None
+    assert results['slow.com'] is None
+    assert results['garbled.com'] is None
+    assert results['missing.com'] == (None, None, {})
+
+
+# ============================================================================
+# DNS ANSWER CACHE
+# ============================================================================
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(analyzer_api.time, 'monotonic', clock)
+    monkeypatch.setattr(analyzer_api.time, 'time', clock)
+    return clock
+
+
+def test_dns_cache_expires_after_ttl(clock):
+    cache = _DNSCache()
+    cache.put(('example.com', 'A'), ['192.0.2.1'], ttl=60)
+
+    clock.now += 59
+    assert cache.get(('example.com', 'A')) == ['192.0.2.1']
+    clock.now += 1
+    assert cache.get(('example.com', 'A')) is _DNSCache.MISS
+
+
+def test_dns_cache_keeps_negatives_distinct_from_misses(clock):
+    cache = _DNSCache()
+    cache.put(('nx.com', 'A'), None, ttl=300)
+
+    assert cache.get(('nx.com', 'A')) is None
+    assert cache.get(('nx.com', 'MX')) is _DNSCache.MISS
+
+
+def test_dns_cache_caps_ttl(clock):
+    cache = _DNSCache(max_ttl=100)
+    cache.put(('example.com', 'A'), ['192.0.2.1'], ttl=86400)
+    cache.put(('zero.com', 'A'), ['192.0.2.2'], ttl=0)
+
+    assert cache.get(('zero.com', 'A')) is _DNSCache.MISS
+    clock.now += 100
+    assert cache.get(('example.com', 'A')) is _DNSCache.MISS
+
+
+def test_dns_cache_evicts_least_recently_used(clock):
+    cache = _DNSCache(maxsize=2)
+    cache.put(('a.com', 'A'), ['192.0.2.1'], ttl=60)
+    cache.put(('b.com', 'A'), ['192.0.2.2'], ttl=60)
+    cache.get(('a.com', 'A'))
+    cache.put(('c.com', 'A'), ['192.0.2.3'], ttl=60)
+
+    assert cache.get(('a.com', 'A')) == ['192.0.2.1']
+    assert cache.get(('b.com', 'A')) is _DNSCache.MISS
+    assert cache.get(('c.com', 'A')) == ['192.0.2.3']
+
+
+# ============================================================================
+# ADAPTIVE DNS TIMEOUT
+# ============================================================================
+
+def test_latency_stats_uses_ceiling_until_warmed_up():
+    stats = _LatencyStats(min_samples=20)
+    for _ in range(19):
+        stats.record(0.05)
+
+    assert stats.p95 is None
+    assert stats.timeout(5.0) == 5.0
+
+
+def test_latency_stats_timeout_is_twice_p95_within_bounds():
+    stats = _LatencyStats(min_samples=20)
+    for _ in range(20):
+        stats.record(0.5)
+
+    assert stats.p95 == pytest.approx(0.5)
+    assert stats.timeout(5.0) == pytest.approx(1.0)
+    assert stats.timeout(0.8) == 0.8
+    assert stats.timeout(5.0, floor=2.0) == 2.0
+
+
+def test_latency_stats_p95_ignores_the_slowest_five_percent():
+    stats = _LatencyStats(min_samples=20)
+    for latency in [0.1] * 95 + [3.0] * 5:
+        stats.record(latency)
+
+    assert stats.p95 < 3.0
+
+
+def test_latency_stats_window_forgets_old_samples():
+    stats = _LatencyStats(window=20, min_samples=20, refresh_every=20)
+    for _ in range(20):
+        stats.record(2.0)
+    assert stats.p95 == pytest.approx(2.0)
+
+    # Not refreshed until refresh_every new samples have arrived
+    for _ in range(19):
+        stats.record(0.1)
+    assert stats.p95 == pytest.approx(2.0)
+
+    stats.record(0.1)
+    assert stats.p95 == pytest.approx(0.1)
+
+
+# ============================================================================
+# ON-DISK WHOIS CACHE
+# ============================================================================
+
+class FakeWhois:
+    """Stand-in for DomainAnalyzer._query_whois that counts lookups."""
+
+    def __init__(self, result=None, error=None):
+        self.result = result
+        self.error = error
+        self.calls = []
+
+    def __call__(self, domain):
+        self.calls.append(domain)
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+@pytest.fixture
+def make_cached(monkeypatch, tmp_path):
+    """Build a CachedDomainAnalyzer in tmp_path whose lookups go to a FakeWhois."""
+    monkeypatch.setattr(analyzer_api, 'WHOIS_AVAILABLE', True)
+
+    def make(lookup, cache_dir=None, **kwargs):
+        analyzer = CachedDomainAnalyzer(
+            AnalysisConfig(target_domain='example.com'),
+            cache_dir=str(cache_dir or tmp_path),
+            **kwargs
+        )
+        analyzer._query_whois = lookup
+        return analyzer
+
+    return make
+
+
+def test_whois_cache_serves_fresh_entries(make_cached, clock):
+    registered = (datetime(2001, 2, 3), 'Example Registrar', {'registrar': 'Example Registrar'})
+    lookup = FakeWhois(result=registered)
+    analyzer = make_cached(lookup, cache_ttl=3600)
+
+    assert analyzer.get_whois('examp1e.com') == registered
+    assert make_cached(lookup).get_whois('examp1e.com') == registered
+    assert lookup.calls == ['examp1e.com']
+
+    clock.now += 3601
+    analyzer.get_whois('examp1e.com')
+    assert lookup.calls == ['examp1e.com', 'examp1e.com']
+
+
+def test_whois_cache_stores_not_found_as_negative(make_cached, clock, tmp_path):
+    lookup = FakeWhois(error=Exception('No match for "EXAMPL3.COM".'))
+    analyzer = make_cached(lookup, negative_ttl=60)
+
+    assert analyzer.get_whois('exampl3.com') == (None, None, {})
+    with open(analyzer._cache_path('exampl3.com'), encoding='utf-8') as f:
+        assert json.load(f)['negative'] is True
+
+    assert analyzer.get_whois('exampl3.com') == (None, None, {})
+    assert len(lookup.calls) == 1
+
+    clock.now += 61
+    analyzer.get_whois('exampl3.com')
+    assert len(lookup.calls) == 2
+
+
+@pytest.mark.parametrize('lookup', [
+    FakeWhois(error=TimeoutError('timed out')),
+    FakeWhois(error=ConnectionResetError()),
+    FakeWhois(result=(None, None, {})),
+])
+def test_whois_cache_skips_failed_lookups(make_cached, tmp_path, lookup):
+    analyzer = make_cached(lookup)
+
+    assert analyzer.get_whois('examp1e.com') == (None, None, {})
+    assert os.listdir(tmp_path) == []
+
+
+def test_whois_cache_treats_corrupt_entries_as_misses(make_cached, tmp_path):
+    analyzer = make_cached(FakeWhois(result=(None, 'Example Registrar', {})))
+    for payload in ('{truncated', '[1, 2]', '{"ts": 1e18, "data": {"creation_date": "bad"}}'):
+        with open(analyzer._cache_path('examp1e.com'), 'w', encoding='utf-8') as f:
+            f.write(payload)
+        assert analyzer.cached_whois('examp1e.com') is None
+
+
+def test_whois_cache_unusable_dir_disables_cache(make_cached, tmp_path):
+    blocker = tmp_path / 'not-a-dir'
+    blocker.write_text('')
+    registered = (None, 'Example Registrar', {})
+    lookup = FakeWhois(result=registered)
+    analyzer = make_cached(lookup, cache_dir=blocker / 'whois')
+
+    assert analyzer.cache_dir is None
+    assert analyzer.get_whois('examp1e.com') == registered
+    assert analyzer.get_whois('examp1e.com') == registered
+    assert len(lookup.calls) == 2